@@ -0,0 +1,30 @@
+from collections.abc import Iterable
+
+from django.core.management import BaseCommand
+
+from accounts.services.auth.concurrent_refresh import AccountRefreshResult
+
+
+class AccountRefreshCommand(BaseCommand):
+    # What is refreshed, as in "Refreshed cookies of ...".
+    refreshed_subject: str
+
+    def write_refresh_results(
+        self,
+        results: Iterable[AccountRefreshResult],
+    ) -> None:
+        for result in results:
+            if result.is_succeeded:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Refreshed {self.refreshed_subject}'
+                        f' of {result.account_name}',
+                    ),
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'Could not refresh {self.refreshed_subject}'
+                        f' of {result.account_name}: {result.error_message}',
+                    ),
+                )
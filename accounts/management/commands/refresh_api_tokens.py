@@ -1,13 +1,35 @@
-from django.core.management import BaseCommand
-
+from accounts.management.base import AccountRefreshCommand
 from accounts.models import AccountTokens
-from accounts.services.auth.api_tokens import APITokensRefreshInteractor
+from accounts.services.auth.api_tokens import (
+    get_expiring_accounts_tokens,
+    refresh_api_tokens,
+)
+
 
+class Command(AccountRefreshCommand):
+    help = 'Refresh API tokens expiring soon'
+    refreshed_subject = 'API tokens'
 
-class Command(BaseCommand):
-    help = 'Refresh API tokens'
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Refresh tokens of all accounts regardless of expiry',
+        )
+        parser.add_argument(
+            '--max-concurrent-refreshes',
+            type=int,
+            default=10,
+        )
 
     def handle(self, *args, **options):
-        accounts_tokens = AccountTokens.objects.all()
-        for account_tokens in accounts_tokens:
-            APITokensRefreshInteractor(account_tokens=account_tokens).execute()
+        if options['all']:
+            accounts_tokens = AccountTokens.objects.select_related('account')
+        else:
+            accounts_tokens = get_expiring_accounts_tokens()
+
+        results = refresh_api_tokens(
+            accounts_tokens,
+            max_concurrent_refreshes=options['max_concurrent_refreshes'],
+        )
+        self.write_refresh_results(results)
@@ -1,36 +1,24 @@
-from django.core.management import BaseCommand
-
-from accounts.models import AccountCookies
-from accounts.services.auth.shift_manager import (
-    ShiftManagerAccountCookiesRefreshInteractor,
+from accounts.management.base import AccountRefreshCommand
+from accounts.services.auth.accounts_cookies import (
+    get_shift_manager_accounts_cookies_refresh_interactors,
+    refresh_accounts_cookies,
 )
-from units.models import Unit
 
 
-class Command(BaseCommand):
+class Command(AccountRefreshCommand):
     help = 'Refresh shift manager accounts cookies'
+    refreshed_subject = 'cookies'
 
-    def handle(self, *args, **options):
-        units = Unit.objects.all()
-
-        account_name_to_unit_uuid = {
-            unit.shift_manager_account_name: unit.uuid
-            for unit in units
-            if unit.shift_manager_account_name is not None
-        }
-
-        accounts_cookies = (
-            AccountCookies.objects
-            .select_related('account')
-            .filter(name__in=account_name_to_unit_uuid.keys())
-            .all()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-concurrent-logins',
+            type=int,
+            default=10,
         )
 
-        for account_cookies in accounts_cookies:
-            unit_uuid = account_name_to_unit_uuid[account_cookies.name]
-
-            interactor = ShiftManagerAccountCookiesRefreshInteractor(
-                account_cookies=account_cookies,
-                unit_uuid=unit_uuid,
-            )
-            interactor.execute()
+    def handle(self, *args, **options):
+        results = refresh_accounts_cookies(
+            get_shift_manager_accounts_cookies_refresh_interactors(),
+            max_concurrent_logins=options['max_concurrent_logins'],
+        )
+        self.write_refresh_results(results)
@@ -0,0 +1,52 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from accounts.models import Account, AccountCookies, AccountTokens
+from accounts.services.crypt import rotate_string
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-encrypt stored credentials with DJANGO_FERNET_KEY after moving'
+        ' the old key to DJANGO_FERNET_PREVIOUS_KEYS'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            accounts = list(Account.objects.select_for_update())
+            for account in accounts:
+                account.encrypted_password = rotate_string(
+                    account.encrypted_password,
+                )
+            Account.objects.bulk_update(accounts, ['encrypted_password'])
+
+            accounts_tokens = list(AccountTokens.objects.select_for_update())
+            for account_tokens in accounts_tokens:
+                account_tokens.encrypted_access_token = rotate_string(
+                    account_tokens.encrypted_access_token,
+                )
+                account_tokens.encrypted_refresh_token = rotate_string(
+                    account_tokens.encrypted_refresh_token,
+                )
+            AccountTokens.objects.bulk_update(
+                accounts_tokens,
+                ['encrypted_access_token', 'encrypted_refresh_token'],
+            )
+
+            accounts_cookies = list(AccountCookies.objects.select_for_update())
+            for account_cookies in accounts_cookies:
+                account_cookies.encrypted_cookies = rotate_string(
+                    account_cookies.encrypted_cookies,
+                )
+            AccountCookies.objects.bulk_update(
+                accounts_cookies,
+                ['encrypted_cookies'],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully re-encrypted {len(accounts)} accounts,'
+                f' {len(accounts_tokens)} tokens'
+                f' and {len(accounts_cookies)} cookies',
+            ),
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_accountcookies_encrypted_cookies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accounttokens',
+            name='access_token_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
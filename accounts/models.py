@@ -16,6 +16,7 @@ class AccountTokens(models.Model):
     account = models.ForeignKey(Account, on_delete=models.CASCADE)
     encrypted_access_token = models.CharField(max_length=255)
     encrypted_refresh_token = models.CharField(max_length=255)
+    access_token_expires_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
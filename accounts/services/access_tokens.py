@@ -0,0 +1,83 @@
+import datetime
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from accounts.models import AccountTokens
+from accounts.services.crypt import decrypt_string
+
+__all__ = (
+    'AccessTokenCache',
+    'access_token_cache',
+    'get_decrypted_access_token',
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CachedAccessToken:
+    access_token: str
+    updated_at: datetime.datetime
+    expires_at: float
+
+
+class AccessTokenCache:
+    """
+    In-memory cache of decrypted access tokens.
+
+    Every account has at most one entry, tagged with
+    `AccountTokens.updated_at`, so a refreshed token is never served from
+    the cache even before the entry of the old one is invalidated or
+    expired. Caching the refreshed token replaces the old entry, and
+    expired entries of other accounts are dropped on every insert, so
+    old decrypted tokens don't stay in memory.
+    """
+
+    def __init__(self, *, ttl_in_seconds: int):
+        self.__ttl_in_seconds = ttl_in_seconds
+        self.__account_id_to_access_token: dict[int, CachedAccessToken] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, account_tokens: AccountTokens) -> str:
+        now = time.monotonic()
+
+        cached = self.__account_id_to_access_token.get(
+            account_tokens.account_id,
+        )
+        if (
+            cached is not None
+            and cached.updated_at == account_tokens.updated_at
+            and cached.expires_at > now
+        ):
+            return cached.access_token
+
+        access_token = decrypt_string(account_tokens.encrypted_access_token)
+        with self.__lock:
+            self.__account_id_to_access_token = {
+                account_id: cached
+                for account_id, cached
+                in self.__account_id_to_access_token.items()
+                if cached.expires_at > now
+            }
+            self.__account_id_to_access_token[account_tokens.account_id] = (
+                CachedAccessToken(
+                    access_token=access_token,
+                    updated_at=account_tokens.updated_at,
+                    expires_at=now + self.__ttl_in_seconds,
+                )
+            )
+        return access_token
+
+    def invalidate(self, account_id: int) -> None:
+        with self.__lock:
+            self.__account_id_to_access_token.pop(account_id, None)
+
+
+access_token_cache = AccessTokenCache(
+    ttl_in_seconds=settings.ACCOUNT_ACCESS_TOKEN_CACHE_TTL_IN_SECONDS,
+)
+
+
+def get_decrypted_access_token(account_tokens: AccountTokens) -> str:
+    return access_token_cache.get(account_tokens)
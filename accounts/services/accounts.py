@@ -1,13 +1,17 @@
-import json
 from dataclasses import dataclass
 
-import httpx
-from cryptography.fernet import Fernet
-from django.conf import settings
-
 from accounts.exceptions import AccountTokensNotFoundError
 from accounts.models import Account, AccountCookies, AccountTokens
-from accounts.services.crypt import decrypt_string
+from accounts.services.access_tokens import get_decrypted_access_token
+from accounts.services.auth.api_tokens import (
+    get_jwt_expires_at,
+    refresh_api_tokens_unless_changed,
+)
+from accounts.services.crypt import (
+    decrypt_dict,
+    decrypt_string,
+    encrypt_string,
+)
 
 __all__ = (
     'upsert_account_tokens',
@@ -32,15 +36,15 @@ def upsert_account_tokens(
         access_token: str,
         refresh_token: str,
 ) -> AccountTokens:
-    fernet = Fernet(settings.FERNET_KEY)
-    encrypted_access_token = fernet.encrypt(access_token.encode()).decode()
-    encrypted_refresh_token = fernet.encrypt(refresh_token.encode()).decode()
+    encrypted_access_token = encrypt_string(access_token)
+    encrypted_refresh_token = encrypt_string(refresh_token)
 
     account_tokens, _ = AccountTokens.objects.update_or_create(
         account=account,
         defaults={
             'encrypted_access_token': encrypted_access_token,
             'encrypted_refresh_token': encrypted_refresh_token,
+            'access_token_expires_at': get_jwt_expires_at(access_token),
         },
     )
 
@@ -77,13 +81,10 @@ def get_decrypted_account_tokens(
         )
     except AccountTokens.DoesNotExist:
         raise AccountTokensNotFoundError
-    fernet = Fernet(settings.FERNET_KEY)
-    decrypted_access_token = fernet.decrypt(
-        account_tokens.encrypted_access_token,
-    ).decode()
-    decrypted_refresh_token = fernet.decrypt(
-        account_tokens.encrypted_refresh_token
-    ).decode()
+    decrypted_access_token = get_decrypted_access_token(account_tokens)
+    decrypted_refresh_token = decrypt_string(
+        account_tokens.encrypted_refresh_token,
+    )
     return AccountPlainTokens(
         account_name=account_name,
         access_token=decrypted_access_token,
@@ -95,9 +96,7 @@ def get_decrypted_account_cookies(
         account_name: str,
 ) -> AccountPlainCookies:
     account_cookies = AccountCookies.objects.get(name=account_name)
-    fernet = Fernet(settings.FERNET_KEY)
-    decrypted_cookies_json = fernet.decrypt(account_cookies.encrypted_cookies)
-    decrypted_cookies = json.loads(decrypted_cookies_json)
+    decrypted_cookies = decrypt_dict(account_cookies.encrypted_cookies)
     return AccountPlainCookies(
         account_name=account_name,
         cookies=decrypted_cookies,
@@ -105,30 +104,4 @@ def get_decrypted_account_cookies(
 
 
 def update_account_tokens(account_tokens: AccountTokens) -> None:
-    fernet = Fernet(settings.FERNET_KEY)
-    refresh_token = (
-        fernet.decrypt(account_tokens.encrypted_refresh_token).decode()
-    )
-
-    url = 'https://auth.dodois.io/connect/token'
-    request_data = {
-        'client_id': settings.DODO_IS_API_CLIENT_ID,
-        'client_secret': settings.DODO_IS_API_CLIENT_SECRET,
-        'grant_type': 'refresh_token',
-        'refresh_token': refresh_token,
-    }
-    with httpx.Client() as http_client:
-        response = http_client.post(url, data=request_data)
-    response_data = response.json()
-
-    plain_access_token: str = response_data['access_token']
-    plain_refresh_token: str = response_data['refresh_token']
-
-    encrypted_access_token = fernet.encrypt(
-        plain_access_token.encode()).decode()
-    encrypted_refresh_token = fernet.encrypt(
-        plain_refresh_token.encode()).decode()
-
-    account_tokens.encrypted_access_token = encrypted_access_token
-    account_tokens.encrypted_refresh_token = encrypted_refresh_token
-    account_tokens.save()
+    refresh_api_tokens_unless_changed(account_tokens)
@@ -0,0 +1,104 @@
+from collections.abc import Iterable
+from typing import Protocol
+
+from accounts.models import AccountCookies
+from accounts.services.auth.concurrent_refresh import (
+    AccountRefresh,
+    AccountRefreshResult,
+    run_account_refreshes,
+)
+from accounts.services.auth.office_manager import (
+    OfficeManagerAccountCookiesRefreshInteractor,
+)
+from accounts.services.auth.shift_manager import (
+    ShiftManagerAccountCookiesRefreshInteractor,
+)
+from units.models import Unit
+
+__all__ = (
+    'get_office_manager_accounts_cookies_refresh_interactors',
+    'get_shift_manager_accounts_cookies_refresh_interactors',
+    'refresh_accounts_cookies',
+)
+
+
+class AccountCookiesRefreshInteractor(Protocol):
+    account_cookies: AccountCookies
+
+    def execute(self) -> None:
+        ...
+
+
+def get_office_manager_accounts_cookies_refresh_interactors() -> list[
+    OfficeManagerAccountCookiesRefreshInteractor
+]:
+    units = Unit.objects.select_related('department').all()
+
+    account_name_to_department_uuid = {
+        unit.office_manager_account_name: unit.department.uuid
+        for unit in units
+        if unit.office_manager_account_name is not None
+    }
+
+    accounts_cookies = (
+        AccountCookies.objects
+        .select_related('account')
+        .filter(name__in=account_name_to_department_uuid.keys())
+        .all()
+    )
+
+    return [
+        OfficeManagerAccountCookiesRefreshInteractor(
+            account_cookies=account_cookies,
+            department_uuid=account_name_to_department_uuid[
+                account_cookies.name
+            ],
+        )
+        for account_cookies in accounts_cookies
+    ]
+
+
+def get_shift_manager_accounts_cookies_refresh_interactors() -> list[
+    ShiftManagerAccountCookiesRefreshInteractor
+]:
+    units = Unit.objects.all()
+
+    account_name_to_unit_uuid = {
+        unit.shift_manager_account_name: unit.uuid
+        for unit in units
+        if unit.shift_manager_account_name is not None
+    }
+
+    accounts_cookies = (
+        AccountCookies.objects
+        .select_related('account')
+        .filter(name__in=account_name_to_unit_uuid.keys())
+        .all()
+    )
+
+    return [
+        ShiftManagerAccountCookiesRefreshInteractor(
+            account_cookies=account_cookies,
+            unit_uuid=account_name_to_unit_uuid[account_cookies.name],
+        )
+        for account_cookies in accounts_cookies
+    ]
+
+
+def refresh_accounts_cookies(
+    interactors: Iterable[AccountCookiesRefreshInteractor],
+    *,
+    max_concurrent_logins: int = 10,
+) -> list[AccountRefreshResult]:
+    """Log in with all accounts concurrently and save the new cookies."""
+    return run_account_refreshes(
+        (
+            AccountRefresh(
+                account_name=interactor.account_cookies.name,
+                refresh=interactor.execute,
+            )
+            for interactor in interactors
+        ),
+        max_concurrent_refreshes=max_concurrent_logins,
+        thread_name_prefix='accounts-cookies-refresh',
+    )
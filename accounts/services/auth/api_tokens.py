@@ -1,40 +1,275 @@
+import base64
+import datetime
+import functools
+import json
+import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
+from typing import Final
 
 import httpx
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 
 from accounts.models import AccountTokens
+from accounts.services.auth.concurrent_refresh import (
+    AccountRefresh,
+    AccountRefreshResult,
+    run_account_refreshes,
+)
 from accounts.services.crypt import decrypt_string, encrypt_string
 
+__all__ = (
+    'APITokensRefreshInteractor',
+    'RefreshedAPITokens',
+    'get_auth_http_client',
+    'get_expiring_accounts_tokens',
+    'get_jwt_expires_at',
+    'refresh_access_token_on_demand',
+    'refresh_api_tokens',
+    'refresh_api_tokens_unless_changed',
+    'request_refreshed_api_tokens',
+)
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL: Final[str] = 'https://auth.dodois.io/connect/token'
+
+# Matches the default count of concurrent refreshes.
+AUTH_HTTP_CLIENT_MAX_CONNECTIONS: Final[int] = 10
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RefreshedAPITokens:
+    access_token: str
+    refresh_token: str
+    access_token_expires_at: datetime.datetime | None
+
+
+@functools.cache
+def get_auth_http_client() -> httpx.Client:
+    """
+    Returns:
+        HTTP client with keep-alive connections to the auth server
+        shared by all threads of the process.
+    """
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=AUTH_HTTP_CLIENT_MAX_CONNECTIONS,
+        ),
+        timeout=30,
+    )
+
+
+def get_jwt_expires_at(token: str) -> datetime.datetime | None:
+    """
+    Read the `exp` claim of a JWT without verifying its signature.
+
+    Returns:
+        Expiry of the token, or None if the token is not a JWT
+        or has no expiry.
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        expires_at_timestamp = json.loads(
+            base64.urlsafe_b64decode(payload),
+        )['exp']
+        return datetime.datetime.fromtimestamp(
+            expires_at_timestamp,
+            tz=datetime.UTC,
+        )
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def get_access_token_expires_at(
+    response_data: dict,
+) -> datetime.datetime | None:
+    expires_in = response_data.get('expires_in')
+    if expires_in is not None:
+        return timezone.now() + datetime.timedelta(seconds=int(expires_in))
+    return get_jwt_expires_at(response_data['access_token'])
+
+
+def request_refreshed_api_tokens(
+    *,
+    http_client: httpx.Client,
+    refresh_token: str,
+) -> RefreshedAPITokens:
+    request_data = {
+        'client_id': settings.DODO_IS_API_CLIENT_ID,
+        'client_secret': settings.DODO_IS_API_CLIENT_SECRET,
+        'grant_type': 'refresh_token',
+        'refresh_token': refresh_token,
+    }
+    response = http_client.post(TOKEN_URL, data=request_data)
+    response.raise_for_status()
+    response_data = response.json()
+
+    return RefreshedAPITokens(
+        access_token=response_data['access_token'],
+        refresh_token=response_data['refresh_token'],
+        access_token_expires_at=get_access_token_expires_at(response_data),
+    )
+
+
+def save_refreshed_api_tokens(
+    account_tokens: AccountTokens,
+    refreshed_api_tokens: RefreshedAPITokens,
+) -> None:
+    account_tokens.encrypted_access_token = encrypt_string(
+        refreshed_api_tokens.access_token,
+    )
+    account_tokens.encrypted_refresh_token = encrypt_string(
+        refreshed_api_tokens.refresh_token,
+    )
+    account_tokens.access_token_expires_at = (
+        refreshed_api_tokens.access_token_expires_at
+    )
+    account_tokens.save()
+
 
 @dataclass(frozen=True, slots=True, kw_only=True)
 class APITokensRefreshInteractor:
     account_tokens: AccountTokens
+    http_client: httpx.Client | None = None
+
+    def get_refreshed_api_tokens(self) -> RefreshedAPITokens:
+        return request_refreshed_api_tokens(
+            http_client=self.http_client or get_auth_http_client(),
+            refresh_token=decrypt_string(
+                self.account_tokens.encrypted_refresh_token,
+            ),
+        )
+
+    def save_api_tokens(
+        self,
+        refreshed_api_tokens: RefreshedAPITokens,
+    ) -> None:
+        save_refreshed_api_tokens(self.account_tokens, refreshed_api_tokens)
 
     def execute(self) -> None:
-        refresh_token = decrypt_string(
-            self.account_tokens.encrypted_refresh_token,
+        self.save_api_tokens(self.get_refreshed_api_tokens())
+
+
+def get_expiring_accounts_tokens(
+    *,
+    refresh_window: datetime.timedelta | None = None,
+) -> QuerySet[AccountTokens]:
+    """
+    Keyword Args:
+        refresh_window: Defaults to the
+            `DODO_IS_API_ACCESS_TOKEN_REFRESH_WINDOW_IN_SECONDS` setting.
+
+    Returns:
+        Tokens expiring within the refresh window, already expired ones,
+        and tokens with unknown expiry.
+    """
+    if refresh_window is None:
+        refresh_window_in_seconds = (
+            settings.DODO_IS_API_ACCESS_TOKEN_REFRESH_WINDOW_IN_SECONDS
+        )
+        refresh_window = datetime.timedelta(seconds=refresh_window_in_seconds)
+    return (
+        AccountTokens.objects
+        .select_related('account')
+        .filter(
+            Q(access_token_expires_at__isnull=True)
+            | Q(access_token_expires_at__lte=timezone.now() + refresh_window),
         )
+    )
 
-        url = 'https://auth.dodois.io/connect/token'
-        request_data = {
-            'client_id': settings.DODO_IS_API_CLIENT_ID,
-            'client_secret': settings.DODO_IS_API_CLIENT_SECRET,
-            'grant_type': 'refresh_token',
-            'refresh_token': refresh_token,
-        }
-        with httpx.Client() as http_client:
-            response = http_client.post(url, data=request_data)
 
-        response_data = response.json()
+def refresh_api_tokens_unless_changed(
+    account_tokens: AccountTokens,
+) -> RefreshedAPITokens | None:
+    """
+    Refresh API tokens of the account unless they changed since being read.
 
-        plain_access_token: str = response_data['access_token']
-        plain_refresh_token: str = response_data['refresh_token']
+    The row is locked while refreshing, so concurrent refreshes of the same
+    account, scheduled or triggered by a rejected token, spend the refresh
+    token once: the others wait and then see that the tokens were already
+    refreshed.
 
-        self.account_tokens.encrypted_access_token = encrypt_string(
-            plain_access_token,
+    Returns:
+        Refreshed tokens, or None if someone else refreshed them first.
+    """
+    with transaction.atomic():
+        locked_account_tokens = (
+            AccountTokens.objects
+            .select_for_update()
+            .get(id=account_tokens.id)
         )
-        self.account_tokens.encrypted_refresh_token = encrypt_string(
-            plain_refresh_token,
+        if locked_account_tokens.updated_at != account_tokens.updated_at:
+            return None
+
+        interactor = APITokensRefreshInteractor(
+            account_tokens=locked_account_tokens,
         )
-        self.account_tokens.save()
+        refreshed_api_tokens = interactor.get_refreshed_api_tokens()
+        interactor.save_api_tokens(refreshed_api_tokens)
+    return refreshed_api_tokens
+
+
+def refresh_account_api_tokens(
+    account_tokens: AccountTokens,
+) -> None:
+    if refresh_api_tokens_unless_changed(account_tokens) is None:
+        logger.info(
+            'API tokens of account %s were already refreshed',
+            account_tokens.account.name,
+        )
+
+
+def refresh_api_tokens(
+    accounts_tokens: Iterable[AccountTokens],
+    *,
+    max_concurrent_refreshes: int = AUTH_HTTP_CLIENT_MAX_CONNECTIONS,
+) -> list[AccountRefreshResult]:
+    """
+    Refresh API tokens of all accounts concurrently, over one shared
+    connection pool and each under the row lock of its account.
+    """
+    return run_account_refreshes(
+        (
+            AccountRefresh(
+                account_name=account_tokens.account.name,
+                refresh=functools.partial(
+                    refresh_account_api_tokens,
+                    account_tokens,
+                ),
+            )
+            for account_tokens in accounts_tokens
+        ),
+        max_concurrent_refreshes=max_concurrent_refreshes,
+        thread_name_prefix='api-tokens-refresh',
+    )
+
+
+def refresh_access_token_on_demand(account_tokens: AccountTokens) -> str:
+    """
+    Refresh the access token rejected by the API.
+
+    If the tokens were refreshed while the rejected request was in flight,
+    the saved access token is reused instead of spending the refresh token
+    again.
+
+    Returns:
+        Access token to retry the rejected request with.
+    """
+    refreshed_api_tokens = refresh_api_tokens_unless_changed(account_tokens)
+    if refreshed_api_tokens is None:
+        return decrypt_string(
+            AccountTokens.objects
+            .values_list('encrypted_access_token', flat=True)
+            .get(id=account_tokens.id),
+        )
+
+    logger.info(
+        'Refreshed rejected access token of account %s',
+        account_tokens.account_id,
+    )
+    return refreshed_api_tokens.access_token
@@ -0,0 +1,89 @@
+import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+
+from django.db import connection
+
+__all__ = (
+    'AccountRefresh',
+    'AccountRefreshResult',
+    'run_account_refreshes',
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AccountRefresh:
+    account_name: str
+    refresh: Callable[[], None]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AccountRefreshResult:
+    account_name: str
+    is_succeeded: bool
+    error_message: str | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def run_in_thread(refresh: Callable[[], None]) -> None:
+    try:
+        refresh()
+    finally:
+        # Threads of the pool don't go through the request cycle
+        # that would close their database connections.
+        connection.close()
+
+
+def run_account_refreshes(
+    account_refreshes: Iterable[AccountRefresh],
+    *,
+    max_concurrent_refreshes: int,
+    thread_name_prefix: str,
+) -> list[AccountRefreshResult]:
+    """
+    Run refreshes of accounts concurrently in a thread pool, so all of
+    them take about as long as the slowest one. A failed refresh doesn't
+    stop the others, it is reported in its result.
+    """
+    account_refreshes = list(account_refreshes)
+    if not account_refreshes:
+        return []
+
+    results: list[AccountRefreshResult] = []
+    with ThreadPoolExecutor(
+        max_workers=min(max_concurrent_refreshes, len(account_refreshes)),
+        thread_name_prefix=thread_name_prefix,
+    ) as executor:
+        future_to_account_refresh = {
+            executor.submit(
+                run_in_thread,
+                account_refresh.refresh,
+            ): account_refresh
+            for account_refresh in account_refreshes
+        }
+        for future in as_completed(future_to_account_refresh):
+            account_name = future_to_account_refresh[future].account_name
+            try:
+                future.result()
+            except Exception as error:
+                logger.exception('Could not refresh account %s', account_name)
+                results.append(
+                    AccountRefreshResult(
+                        account_name=account_name,
+                        is_succeeded=False,
+                        error_message=str(error),
+                    ),
+                )
+            else:
+                results.append(
+                    AccountRefreshResult(
+                        account_name=account_name,
+                        is_succeeded=True,
+                    ),
+                )
+    return results
@@ -249,7 +249,8 @@ class OfficeManagerAccountCookiesRefreshInteractor:
     account_cookies: AccountCookies
     department_uuid: UUID
 
-    def execute(self):
+    def get_refreshed_cookies(self) -> dict[str, str]:
+        """Log in again, without saving anything to the database."""
         account_with_plain_credentials = decrypt_account(
             self.account_cookies.account,
         )
@@ -286,6 +287,11 @@ class OfficeManagerAccountCookiesRefreshInteractor:
                 department_uuid=self.department_uuid,
             )
             cookies = dict(office_manager_http_client.cookies)
+        return cookies
 
+    def save_cookies(self, cookies: dict[str, str]) -> None:
         self.account_cookies.encrypted_cookies = encrypt_dict(cookies)
         self.account_cookies.save()
+
+    def execute(self):
+        self.save_cookies(self.get_refreshed_cookies())
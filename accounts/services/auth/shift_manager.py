@@ -129,7 +129,8 @@ class ShiftManagerAccountCookiesRefreshInteractor:
     account_cookies: AccountCookies
     unit_uuid: UUID
 
-    def execute(self):
+    def get_refreshed_cookies(self) -> dict[str, str]:
+        """Log in again, without saving anything to the database."""
         account_with_plain_credentials = decrypt_account(
             self.account_cookies.account,
         )
@@ -164,6 +165,11 @@ class ShiftManagerAccountCookiesRefreshInteractor:
             cookies = account_authenticator.authenticate_specific_unit(
                 unit_uuid=self.unit_uuid,
             )
+        return cookies
 
+    def save_cookies(self, cookies: dict[str, str]) -> None:
         self.account_cookies.encrypted_cookies = encrypt_dict(cookies)
         self.account_cookies.save()
+
+    def execute(self):
+        self.save_cookies(self.get_refreshed_cookies())
@@ -1,19 +1,29 @@
+import functools
 import json
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
 from django.conf import settings
 
 __all__ = (
     'create_fernet',
     'encrypt_string',
     'decrypt_string',
+    'rotate_string',
     'encrypt_dict',
     'decrypt_dict',
 )
 
 
-def create_fernet() -> Fernet:
-    return Fernet(settings.FERNET_KEY)
+@functools.cache
+def create_fernet() -> MultiFernet:
+    """
+    Returns:
+        Process-wide Fernet encrypting with `FERNET_KEY` and decrypting
+        with it or any of `FERNET_PREVIOUS_KEYS`, so values encrypted
+        before key rotation are still readable.
+    """
+    keys = [settings.FERNET_KEY, *settings.FERNET_PREVIOUS_KEYS]
+    return MultiFernet([Fernet(key) for key in keys])
 
 
 def encrypt_string(value: str) -> str:
@@ -24,6 +34,11 @@ def decrypt_string(value: str) -> str:
     return create_fernet().decrypt(value.encode()).decode()
 
 
+def rotate_string(value: str) -> str:
+    """Re-encrypt the value with the current key."""
+    return create_fernet().rotate(value.encode()).decode()
+
+
 def encrypt_dict(value: dict) -> str:
     return create_fernet().encrypt(json.dumps(value).encode()).decode()
 
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import AccountTokens
+from accounts.services.access_tokens import access_token_cache
+
+
+@receiver(post_save, sender=AccountTokens)
+@receiver(post_delete, sender=AccountTokens)
+def invalidate_access_token_cache(
+    sender,
+    instance: AccountTokens,
+    **kwargs,
+) -> None:
+    access_token_cache.invalidate(instance.account_id)
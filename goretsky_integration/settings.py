@@ -132,14 +132,51 @@ if SENTRY_DSN is not None:
     )
 
 FERNET_KEY = env.str('DJANGO_FERNET_KEY')
+# Keys replaced by FERNET_KEY, still used to decrypt old values.
+FERNET_PREVIOUS_KEYS = env.list('DJANGO_FERNET_PREVIOUS_KEYS', default=[])
+ACCOUNT_ACCESS_TOKEN_CACHE_TTL_IN_SECONDS = env.int(
+    'DJANGO_ACCOUNT_ACCESS_TOKEN_CACHE_TTL_IN_SECONDS',
+    default=5 * 60,
+)
 
 DODO_IS_API_CLIENT_ID = env.str('DJANGO_DODO_IS_API_CLIENT_ID')
 DODO_IS_API_CLIENT_SECRET = env.str('DJANGO_DODO_IS_API_CLIENT_SECRET')
+# Access tokens expiring within this window are refreshed by the schedule.
+DODO_IS_API_ACCESS_TOKEN_REFRESH_WINDOW_IN_SECONDS = env.int(
+    'DJANGO_DODO_IS_API_ACCESS_TOKEN_REFRESH_WINDOW_IN_SECONDS',
+    default=30 * 60,
+)
 
 TELEGRAM_BOT_TOKEN = env.str('DJANGO_TELEGRAM_BOT_TOKEN')
 
+# Inventory stocks jobs reuse a snapshot taken by another job within
+# this window instead of fetching stocks again.
+INVENTORY_STOCKS_SNAPSHOT_MAX_AGE_IN_SECONDS = env.int(
+    'DJANGO_INVENTORY_STOCKS_SNAPSHOT_MAX_AGE_IN_SECONDS',
+    default=30 * 60,
+)
+
 GOOGLE_SHEETS_CREDENTIALS = BASE_DIR / 'google_sheets_credentials.json'
 
 REDIS_URL = env.str('DJANGO_REDIS_URL')
 
+REPORT_ROUTING_TABLE_CACHE_USE_REDIS = env.bool(
+    'DJANGO_REPORT_ROUTING_TABLE_CACHE_USE_REDIS',
+    default=True,
+)
+REPORT_ROUTING_TABLE_CACHE_TTL_IN_SECONDS = env.int(
+    'DJANGO_REPORT_ROUTING_TABLE_CACHE_TTL_IN_SECONDS',
+    default=5 * 60,
+)
+
+TELEGRAM_OUTBOX_USE_REDIS_QUEUE = env.bool(
+    'DJANGO_TELEGRAM_OUTBOX_USE_REDIS_QUEUE',
+    default=False,
+)
+# Share the global Telegram rate limit between outbox workers.
+TELEGRAM_RATE_LIMITER_USE_REDIS = env.bool(
+    'DJANGO_TELEGRAM_RATE_LIMITER_USE_REDIS',
+    default=True,
+)
+
 DATA_UPLOAD_MAX_NUMBER_FIELDS = None
@@ -0,0 +1,48 @@
+from django.core.management import BaseCommand, CommandError
+
+from core.exceptions import NotFoundError
+from reports.services.report_registry import report_use_case_registry
+
+
+class Command(BaseCommand):
+    help = 'Create on-demand report of the given report type for the chat'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'report_type_name',
+            nargs='?',
+            choices=report_use_case_registry.get_report_type_names(),
+        )
+        parser.add_argument('--chat-id', type=int)
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List report types that can be created on demand',
+        )
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name in report_use_case_registry.get_report_type_names():
+                self.stdout.write(
+                    f'{name}: {report_use_case_registry.get_import_path(name)}',
+                )
+            return
+
+        report_type_name = options['report_type_name']
+        chat_id = options['chat_id']
+        if report_type_name is None or chat_id is None:
+            raise CommandError('Report type name and --chat-id are required')
+
+        try:
+            report_use_case_registry.create_report(
+                report_type_name=report_type_name,
+                chat_id=chat_id,
+            )
+        except NotFoundError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully created {report_type_name} report',
+            ),
+        )
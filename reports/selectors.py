@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from django.db.models import QuerySet
 
 from core.exceptions import NotFoundError
@@ -27,6 +29,24 @@ def get_report_routes() -> QuerySet[ReportRoute]:
     return ReportRoute.objects.all()
 
 
+def get_report_routing_table(report_type_name: str) -> dict[UUID, list[int]]:
+    """
+    Load all routes of the report type in a single query.
+
+    Returns:
+        Mapping of unit uuid to chat IDs subscribed to the report type.
+    """
+    report_routes = (
+        ReportRoute.objects
+        .filter(report_type__name=report_type_name)
+        .values_list('unit__uuid', 'telegram_chat__chat_id')
+    )
+    unit_uuid_to_chat_ids: dict[UUID, list[int]] = {}
+    for unit_uuid, chat_id in report_routes:
+        unit_uuid_to_chat_ids.setdefault(unit_uuid, []).append(chat_id)
+    return unit_uuid_to_chat_ids
+
+
 def filter_report_routes_by_chat_id(
         *,
         queryset: QuerySet[ReportRoute],
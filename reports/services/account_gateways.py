@@ -0,0 +1,58 @@
+import contextlib
+import functools
+from collections.abc import AsyncGenerator, Generator
+
+from asgiref.sync import sync_to_async
+
+from accounts.models import AccountTokens
+from accounts.services.access_tokens import get_decrypted_access_token
+from accounts.services.auth.api_tokens import refresh_access_token_on_demand
+from reports.services.gateways.dodo_is_api import (
+    AsyncDodoIsApiGateway,
+    DodoIsApiGateway,
+    get_async_dodo_is_api_gateway,
+    get_dodo_is_api_gateway,
+)
+
+__all__ = (
+    'get_account_async_dodo_is_api_gateway',
+    'get_account_dodo_is_api_gateway',
+)
+
+
+@contextlib.contextmanager
+def get_account_dodo_is_api_gateway(
+    account_tokens: AccountTokens,
+    timeout: int = 60,
+) -> Generator[DodoIsApiGateway, None, None]:
+    """
+    Gateway authorized with the access token of the account, refreshing
+    the token if the API rejects it.
+    """
+    with get_dodo_is_api_gateway(
+        access_token=get_decrypted_access_token(account_tokens),
+        timeout=timeout,
+        refresh_access_token=functools.partial(
+            refresh_access_token_on_demand,
+            account_tokens,
+        ),
+    ) as dodo_is_api_gateway:
+        yield dodo_is_api_gateway
+
+
+@contextlib.asynccontextmanager
+async def get_account_async_dodo_is_api_gateway(
+    account_tokens: AccountTokens,
+    timeout: int = 60,
+    max_concurrent_requests: int = 10,
+) -> AsyncGenerator[AsyncDodoIsApiGateway, None]:
+    """Asynchronous counterpart of `get_account_dodo_is_api_gateway`."""
+    async with get_async_dodo_is_api_gateway(
+        access_token=get_decrypted_access_token(account_tokens),
+        timeout=timeout,
+        max_concurrent_requests=max_concurrent_requests,
+        refresh_access_token=sync_to_async(
+            functools.partial(refresh_access_token_on_demand, account_tokens),
+        ),
+    ) as dodo_is_api_gateway:
+        yield dodo_is_api_gateway
@@ -0,0 +1,90 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any, TypeAlias
+from uuid import UUID
+
+from accounts.models import AccountTokens
+from reports.services.account_gateways import (
+    get_account_async_dodo_is_api_gateway,
+)
+from reports.services.gateways.dodo_is_api import AsyncDodoIsApiGateway
+from units.models import Unit
+
+
+DodoIsApiFetch: TypeAlias = Callable[
+    [AsyncDodoIsApiGateway, set[UUID]],
+    Awaitable[list[Any]],
+]
+
+
+async def fetch_for_account(
+    *,
+    account_tokens: AccountTokens,
+    unit_ids: set[UUID],
+    fetches: Mapping[str, DodoIsApiFetch],
+) -> dict[str, list[Any]]:
+    async with get_account_async_dodo_is_api_gateway(
+        account_tokens,
+    ) as dodo_is_api_gateway:
+        results = await asyncio.gather(
+            *(fetch(dodo_is_api_gateway, unit_ids) for fetch in fetches.values()),
+        )
+    return dict(zip(fetches.keys(), results))
+
+
+async def fetch_for_accounts_async(
+    *,
+    account_tokens_and_unit_ids: Iterable[tuple[AccountTokens, set[UUID]]],
+    fetches: Mapping[str, DodoIsApiFetch],
+) -> dict[str, list[Any]]:
+    accounts_results = await asyncio.gather(
+        *(
+            fetch_for_account(
+                account_tokens=account_tokens,
+                unit_ids=unit_ids,
+                fetches=fetches,
+            )
+            for account_tokens, unit_ids in account_tokens_and_unit_ids
+        ),
+    )
+
+    merged_results: dict[str, list[Any]] = {name: [] for name in fetches}
+    for account_results in accounts_results:
+        for name, result in account_results.items():
+            merged_results[name] += result
+    return merged_results
+
+
+def fetch_for_accounts(
+    account_tokens_and_units: Iterable[tuple[AccountTokens, Iterable[Unit]]],
+    **fetches: DodoIsApiFetch,
+) -> dict[str, list[Any]]:
+    """
+    Run every fetch for every account concurrently and merge the results.
+
+    Each fetch receives a gateway of the account and uuids of its units.
+    Results of the same fetch are concatenated across all accounts and
+    returned under the keyword argument name the fetch was passed with.
+
+    Example:
+        fetch_for_accounts(
+            account_tokens_and_units,
+            today_sales=lambda gateway, unit_ids: (
+                gateway.get_units_sales_for_period(
+                    date_from=today.start,
+                    date_to=today.end,
+                    unit_ids=unit_ids,
+                )
+            ),
+        )
+    """
+    account_tokens_and_unit_ids = [
+        (account_tokens, {unit.uuid for unit in units})
+        for account_tokens, units in account_tokens_and_units
+    ]
+    return asyncio.run(
+        fetch_for_accounts_async(
+            account_tokens_and_unit_ids=account_tokens_and_unit_ids,
+            fetches=fetches,
+        ),
+    )
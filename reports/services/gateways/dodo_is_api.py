@@ -1,11 +1,18 @@
+import asyncio
 import contextlib
 import datetime
 import logging
-from collections.abc import Generator
+import threading
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+)
 from dataclasses import dataclass
 from enum import StrEnum
 from itertools import batched
-from typing import ClassVar, Iterable, NewType, Annotated, Final
+from typing import ClassVar, Iterable, NewType, Annotated, Final, TypeVar
 from uuid import UUID
 
 import httpx
@@ -15,6 +22,11 @@ from pydantic import ValidationError, Field, BaseModel, computed_field
 logger = logging.getLogger(__name__)
 
 DodoIsApiHttpClient = NewType('DodoIsApiHttpClient', httpx.Client)
+AsyncDodoIsApiHttpClient = NewType(
+    'AsyncDodoIsApiHttpClient', httpx.AsyncClient,
+)
+
+ResponseT = TypeVar('ResponseT', bound=BaseModel)
 
 
 class InventoryStockCategoryName(StrEnum):
@@ -79,6 +91,23 @@ def join_unit_ids_with_comma(unit_ids: Iterable[UUID]) -> str:
     return ','.join([unit_id.hex for unit_id in unit_ids])
 
 
+def group_by_unit_id(
+    unit_ids: Iterable[UUID],
+    items: Iterable[InventoryStockItem],
+) -> dict[UUID, list[InventoryStockItem]]:
+    """
+    Returns:
+        Items of every unit, units without items included with
+        an empty list.
+    """
+    unit_id_to_items: dict[UUID, list[InventoryStockItem]] = {
+        unit_id: [] for unit_id in unit_ids
+    }
+    for item in items:
+        unit_id_to_items.setdefault(item.unit_id, []).append(item)
+    return unit_id_to_items
+
+
 class StaffMemberBirthday(BaseModel):
     staff_id: Annotated[UUID, Field(validation_alias='staffId')]
     first_name: Annotated[str, Field(validation_alias='firstName')]
@@ -444,10 +473,102 @@ def get_dodo_is_api_http_client(
         yield DodoIsApiHttpClient(http_client)
 
 
+def is_authorization_rejected(response: httpx.Response) -> bool:
+    return response.status_code == httpx.codes.UNAUTHORIZED
+
+
+class AccessTokenRefresher:
+    """
+    Replaces the access token of an HTTP client rejected by the API.
+
+    The token is refreshed at most once, so a token rejected even after
+    refresh doesn't make every following request hit the auth server.
+    Requests rejected with the old token while it was being refreshed
+    are retried with the new one without refreshing it again. If the auth
+    server fails to refresh the token, the rejected response is kept,
+    so only requests of this account fail.
+    """
+
+    def __init__(self, refresh_access_token: Callable[[], str]):
+        self.__refresh_access_token = refresh_access_token
+        self.__is_refreshed = False
+        self.__lock = threading.Lock()
+
+    def refresh(
+        self,
+        http_client: httpx.Client,
+        rejected_response: httpx.Response,
+    ) -> bool:
+        """
+        Returns:
+            True if the rejected request should be retried.
+        """
+        with self.__lock:
+            rejected_authorization = (
+                rejected_response.request.headers.get('Authorization')
+            )
+            current_authorization = http_client.headers.get('Authorization')
+            if current_authorization != rejected_authorization:
+                # Already refreshed by another request.
+                return True
+            if self.__is_refreshed:
+                return False
+            self.__is_refreshed = True
+            try:
+                access_token = self.__refresh_access_token()
+            except httpx.HTTPError:
+                logger.exception('Could not refresh rejected access token')
+                return False
+            http_client.headers['Authorization'] = f'Bearer {access_token}'
+            return True
+
+
+class AsyncAccessTokenRefresher:
+    """Asynchronous counterpart of `AccessTokenRefresher`."""
+
+    def __init__(self, refresh_access_token: Callable[[], Awaitable[str]]):
+        self.__refresh_access_token = refresh_access_token
+        self.__is_refreshed = False
+        self.__lock = asyncio.Lock()
+
+    async def refresh(
+        self,
+        http_client: httpx.AsyncClient,
+        rejected_response: httpx.Response,
+    ) -> bool:
+        """
+        Returns:
+            True if the rejected request should be retried.
+        """
+        async with self.__lock:
+            rejected_authorization = (
+                rejected_response.request.headers.get('Authorization')
+            )
+            current_authorization = http_client.headers.get('Authorization')
+            if current_authorization != rejected_authorization:
+                # Already refreshed by another request.
+                return True
+            if self.__is_refreshed:
+                return False
+            self.__is_refreshed = True
+            try:
+                access_token = await self.__refresh_access_token()
+            except httpx.HTTPError:
+                logger.exception('Could not refresh rejected access token')
+                return False
+            http_client.headers['Authorization'] = f'Bearer {access_token}'
+            return True
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class DodoIsApiGateway:
+    """
+    If `access_token_refresher` is set, a request rejected with
+    `401 Unauthorized` is retried once with a refreshed access token.
+    """
     batch_size: ClassVar[int] = 30
     http_client: DodoIsApiHttpClient
+    access_token_refresher: AccessTokenRefresher | None = None
 
     def get_batched_units(
         self,
@@ -849,6 +970,21 @@ class DodoIsApiGateway:
 
         return staff_birthdays
 
+    def _send_request(
+        self,
+        url: str,
+        params: dict[str, str | int],
+    ) -> httpx.Response:
+        response = self.http_client.get(url=url, params=params)
+        if (
+            is_authorization_rejected(response)
+            and self.access_token_refresher is not None
+            and self.access_token_refresher.refresh(self.http_client, response)
+        ):
+            logger.info('Retrying %s with refreshed access token', url)
+            response = self.http_client.get(url=url, params=params)
+        return response
+
     def _try_send_request_with_server_error_handling(
         self,
         url: str,
@@ -856,7 +992,7 @@ class DodoIsApiGateway:
         max_retries: int = 5,
     ) -> httpx.Response | None:
         for attempt in range(1, max_retries + 1):
-            response = self.http_client.get(url=url, params=params)
+            response = self._send_request(url=url, params=params)
 
             if response.is_server_error:
                 logger.warning(
@@ -917,6 +1053,99 @@ class DodoIsApiGateway:
                     if inventory_stocks_response.is_end_of_list_reached:
                         break
 
+    def get_inventory_stocks_by_units(
+        self,
+        *,
+        unit_ids: Iterable[UUID],
+    ) -> dict[UUID, list[InventoryStockItem]]:
+        """
+        Request stocks of many units per call and split them by unit.
+
+        A batch that fails is requested again unit by unit, so a unit
+        breaking the request doesn't lose stocks of the other units.
+
+        Returns:
+            Stocks of every unit fetched successfully, units without
+            stocks included with an empty list. Units whose stocks could
+            not be fetched are logged and left out.
+        """
+        unit_id_to_items: dict[UUID, list[InventoryStockItem]] = {}
+
+        for unit_ids_batch in self.get_batched_units(unit_ids):
+            items = self._get_inventory_stocks_batch(unit_ids_batch)
+            if items is not None:
+                unit_id_to_items |= group_by_unit_id(unit_ids_batch, items)
+                continue
+
+            if len(unit_ids_batch) == 1:
+                continue
+            logger.warning(
+                'Requesting inventory stocks of units %s one by one',
+                unit_ids_batch,
+            )
+            for unit_id in unit_ids_batch:
+                items = self._get_inventory_stocks_batch((unit_id,))
+                if items is not None:
+                    unit_id_to_items[unit_id] = items
+
+        return unit_id_to_items
+
+    def _get_inventory_stocks_batch(
+        self,
+        unit_ids_batch: tuple[UUID, ...],
+    ) -> list[InventoryStockItem] | None:
+        """
+        Returns:
+            All pages of stocks of the units, or None if any page failed.
+        """
+        take: int = 1000
+        url = '/ru/accounting/inventory-stocks'
+
+        items: list[InventoryStockItem] = []
+        for skip in range(0, 100_000, take):
+            try:
+                response = (
+                    self._try_send_request_with_server_error_handling(
+                        url=url,
+                        params={
+                            'units': join_unit_ids_with_comma(unit_ids_batch),
+                            'take': take,
+                            'skip': skip,
+                        },
+                    )
+                )
+            except httpx.RequestError:
+                logger.exception(
+                    'Failed to get inventory stocks for units %s.'
+                    ' Request failed.',
+                    unit_ids_batch,
+                )
+                return None
+
+            if response is None:
+                logger.error(
+                    'Failed to get inventory stocks for units %s. No response.',
+                    unit_ids_batch,
+                )
+                return None
+
+            try:
+                inventory_stocks_response = InventoryStocksResponse.model_validate_json(
+                    response.text,
+                )
+            except ValidationError:
+                logger.exception(
+                    'Failed to parse inventory stocks response for unit ids: %s',
+                    unit_ids_batch,
+                )
+                return None
+
+            items += inventory_stocks_response.stocks
+            if inventory_stocks_response.is_end_of_list_reached:
+                break
+
+        return items
+
     def get_recent_feedbacks(
         self,
         *,
@@ -1038,9 +1267,543 @@ class DodoIsApiGateway:
 def get_dodo_is_api_gateway(
     access_token: str,
     timeout: int = 60,
+    refresh_access_token: Callable[[], str] | None = None,
 ) -> Generator[DodoIsApiGateway, None, None]:
+    """
+    Keyword Args:
+        refresh_access_token: Called to get a new access token when
+            the API rejects the current one.
+    """
+    access_token_refresher = None
+    if refresh_access_token is not None:
+        access_token_refresher = AccessTokenRefresher(refresh_access_token)
+
     with get_dodo_is_api_http_client(
         access_token=access_token,
         timeout=timeout,
     ) as http_client:
-        yield DodoIsApiGateway(http_client=http_client)
+        yield DodoIsApiGateway(
+            http_client=http_client,
+            access_token_refresher=access_token_refresher,
+        )
+
+
+@contextlib.asynccontextmanager
+async def get_async_dodo_is_api_http_client(
+    access_token: str,
+    timeout: int = 60,
+    max_connections: int = 10,
+) -> AsyncGenerator[AsyncDodoIsApiHttpClient, None]:
+    async with httpx.AsyncClient(
+        headers={
+            'Authorization': f'Bearer {access_token}',
+        },
+        base_url='https://api.dodois.io/dodopizza/',
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=max_connections),
+    ) as http_client:
+        yield AsyncDodoIsApiHttpClient(http_client)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AsyncDodoIsApiGateway:
+    """
+    Asynchronous counterpart of `DodoIsApiGateway`.
+
+    Unit batches are requested concurrently, but no more than
+    `semaphore` allows at the same time. Pages of a single batch are
+    still requested one after another, because the end of the list is
+    known only from the previous page.
+
+    Unlike the sync gateway, a failed batch does not stop the others:
+    server errors, transport errors, timeouts and unparsable responses
+    are logged and the batch is skipped.
+    """
+    batch_size: ClassVar[int] = 30
+    http_client: AsyncDodoIsApiHttpClient
+    semaphore: asyncio.Semaphore
+    access_token_refresher: AsyncAccessTokenRefresher | None = None
+
+    def get_batched_units(
+        self,
+        unit_ids: Iterable[UUID],
+    ) -> list[tuple[UUID, ...]]:
+        return list(batched(unit_ids, n=self.batch_size))
+
+    async def get_couriers_orders(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+    ) -> list[CourierOrder]:
+        pages = await self._get_paginated_batches(
+            url='/ru/delivery/couriers-orders',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            take=1000,
+            response_type=CourierOrdersResponse,
+            resource_name='couriers orders',
+        )
+        return [order for page in pages for order in page.couriers_orders]
+
+    async def get_orders_handover_statistics(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+        sales_channels: Iterable[SalesChannel] | None = None,
+    ) -> list[UnitOrdersHandoverStatistics]:
+        params: dict[str, str | int] = {
+            'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+            'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+        }
+        if sales_channels:
+            params['salesChannels'] = ','.join(
+                [str(channel.value) for channel in sales_channels],
+            )
+
+        responses = await self._get_batches(
+            url='/ru/production/orders-handover-statistics',
+            params=params,
+            unit_ids=unit_ids,
+            response_type=OrdersHandoverStatisticsResponse,
+            resource_name='orders handover statistics',
+        )
+        return [
+            statistics
+            for response in responses
+            for statistics in response.orders_handover_statistics
+        ]
+
+    async def get_production_productivity(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+    ) -> list[UnitProductionProductivity]:
+        responses = await self._get_batches(
+            url='/ru/production/productivity',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            response_type=ProductivityProductivityResponse,
+            resource_name='production productivity',
+        )
+        return [
+            statistics
+            for response in responses
+            for statistics in response.productivity_statistics
+        ]
+
+    async def get_delivery_vouchers(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+    ) -> list[LateDeliveryVoucher]:
+        pages = await self._get_paginated_batches(
+            url='/ru/delivery/vouchers',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            take=1000,
+            response_type=LateDeliveryVouchersResponse,
+            resource_name='delivery vouchers',
+        )
+        return [voucher for page in pages for voucher in page.vouchers]
+
+    async def get_delivery_statistics(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+    ) -> list[UnitDeliveryStatistics]:
+        responses = await self._get_batches(
+            url='/ru/delivery/statistics',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            response_type=UnitsDeliveryStatisticsResponse,
+            resource_name='delivery statistics',
+        )
+        return [
+            statistics
+            for response in responses
+            for statistics in response.units_statistics
+        ]
+
+    async def get_stop_sales_by_ingredients(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+    ) -> list[StopSaleByIngredient]:
+        responses = await self._get_batches(
+            url='/ru/production/stop-sales-ingredients',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            response_type=StopSalesByIngredientsResponse,
+            resource_name='stop sales by ingredients',
+        )
+        return [
+            stop_sale
+            for response in responses
+            for stop_sale in response.stop_sales
+        ]
+
+    async def get_stop_sales_by_sectors(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+    ) -> list[StopSaleBySector]:
+        responses = await self._get_batches(
+            url='/ru/delivery/stop-sales-sectors',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            response_type=StopSalesBySectorsResponse,
+            resource_name='stop sales by sectors',
+        )
+        return [
+            stop_sale
+            for response in responses
+            for stop_sale in response.stop_sales
+        ]
+
+    async def get_stop_sales_by_sales_channels(
+        self,
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        unit_ids: Iterable[UUID],
+    ) -> list[StopSaleBySalesChannel]:
+        responses = await self._get_batches(
+            url='/ru/production/stop-sales-channels',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            response_type=StopSalesBySalesChannelsResponse,
+            resource_name='stop sales by sales channels',
+        )
+        return [
+            stop_sale
+            for response in responses
+            for stop_sale in response.stop_sales
+        ]
+
+    async def get_staff_members_birthdays(
+        self,
+        *,
+        day_from: int,
+        day_to: int,
+        month_from: int,
+        month_to: int,
+        unit_ids: Iterable[UUID],
+    ) -> list[StaffMemberBirthday]:
+        pages = await self._get_paginated_batches(
+            url='/ru/staff/members/birthdays',
+            params={
+                'dayFrom': day_from,
+                'dayTo': day_to,
+                'monthFrom': month_from,
+                'monthTo': month_to,
+            },
+            unit_ids=unit_ids,
+            take=100,
+            response_type=StaffMembersBirthdaysResponse,
+            resource_name='staff members birthdays',
+        )
+        return [birthday for page in pages for birthday in page.birthdays]
+
+    async def get_inventory_stocks(
+        self,
+        *,
+        unit_ids: Iterable[UUID],
+    ) -> list[InventoryStockItem]:
+        pages = await self._get_paginated_batches(
+            url='/ru/accounting/inventory-stocks',
+            params={},
+            unit_ids=unit_ids,
+            take=1000,
+            response_type=InventoryStocksResponse,
+            resource_name='inventory stocks',
+        )
+        return [stock for page in pages for stock in page.stocks]
+
+    async def get_recent_feedbacks(
+        self,
+        *,
+        unit_ids: Iterable[UUID],
+        include_feedbacks_with_empty_comment: bool = False,
+    ) -> list[OrderFeedback]:
+        responses = await self._get_batches(
+            url='/customer-feedback/recent-feedbacks',
+            params={
+                'includeFeedbacksWithEmptyComment': (
+                    include_feedbacks_with_empty_comment
+                ),
+            },
+            unit_ids=unit_ids,
+            response_type=OrderFeedbacksResponse,
+            resource_name='recent feedbacks',
+        )
+        return [
+            feedback
+            for response in responses
+            for feedback in response.feedbacks
+        ]
+
+    async def get_units_sales_for_period(
+        self,
+        *,
+        unit_ids: Iterable[UUID],
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+    ) -> list[UnitSales]:
+        responses = await self._get_batches(
+            url='/ru/finances/sales/units',
+            params={
+                'from': f'{date_from:%Y-%m-%dT%H:%M:%S}',
+                'to': f'{date_to:%Y-%m-%dT%H:%M:%S}',
+            },
+            unit_ids=unit_ids,
+            response_type=UnitsSalesResponse,
+            resource_name='units sales',
+        )
+        return [
+            unit_sales
+            for response in responses
+            for unit_sales in response.result
+        ]
+
+    async def get_stock_items(self) -> list[StockItem]:
+        pages = await self._get_pages(
+            url='/ru/accounting/stock-items',
+            params={},
+            take=1000,
+            response_type=StockItemsResponse,
+            resource_name='stock items',
+        )
+        return [stock_item for page in pages for stock_item in page.stock_items]
+
+    async def _get_batches(
+        self,
+        *,
+        url: str,
+        params: dict[str, str | int],
+        unit_ids: Iterable[UUID],
+        response_type: type[ResponseT],
+        resource_name: str,
+    ) -> list[ResponseT]:
+        responses = await asyncio.gather(
+            *(
+                self._get_page(
+                    url=url,
+                    params={
+                        'units': join_unit_ids_with_comma(unit_ids_batch),
+                        **params,
+                    },
+                    response_type=response_type,
+                    resource_name=resource_name,
+                    unit_ids_batch=unit_ids_batch,
+                )
+                for unit_ids_batch in self.get_batched_units(unit_ids)
+            ),
+        )
+        return [response for response in responses if response is not None]
+
+    async def _get_paginated_batches(
+        self,
+        *,
+        url: str,
+        params: dict[str, str | int],
+        unit_ids: Iterable[UUID],
+        take: int,
+        response_type: type[ResponseT],
+        resource_name: str,
+    ) -> list[ResponseT]:
+        batches_pages = await asyncio.gather(
+            *(
+                self._get_pages(
+                    url=url,
+                    params={
+                        'units': join_unit_ids_with_comma(unit_ids_batch),
+                        **params,
+                    },
+                    take=take,
+                    response_type=response_type,
+                    resource_name=resource_name,
+                    unit_ids_batch=unit_ids_batch,
+                )
+                for unit_ids_batch in self.get_batched_units(unit_ids)
+            ),
+        )
+        return [page for pages in batches_pages for page in pages]
+
+    async def _get_pages(
+        self,
+        *,
+        url: str,
+        params: dict[str, str | int],
+        take: int,
+        response_type: type[ResponseT],
+        resource_name: str,
+        unit_ids_batch: tuple[UUID, ...] = (),
+    ) -> list[ResponseT]:
+        pages: list[ResponseT] = []
+        for skip in range(0, 100_000, take):
+            page = await self._get_page(
+                url=url,
+                params={**params, 'take': take, 'skip': skip},
+                response_type=response_type,
+                resource_name=resource_name,
+                unit_ids_batch=unit_ids_batch,
+            )
+            if page is None:
+                break
+            pages.append(page)
+            if page.is_end_of_list_reached:
+                break
+        return pages
+
+    async def _get_page(
+        self,
+        *,
+        url: str,
+        params: dict[str, str | int],
+        response_type: type[ResponseT],
+        resource_name: str,
+        unit_ids_batch: tuple[UUID, ...] = (),
+    ) -> ResponseT | None:
+        try:
+            response = (
+                await self._try_send_request_with_server_error_handling(
+                    url=url,
+                    params=params,
+                )
+            )
+        except httpx.RequestError:
+            logger.exception(
+                'Failed to get %s for units %s. Request failed.',
+                resource_name,
+                unit_ids_batch,
+            )
+            return None
+        if response is None:
+            logger.error(
+                'Failed to get %s for units %s. No response.',
+                resource_name,
+                unit_ids_batch,
+            )
+            return None
+
+        try:
+            return response_type.model_validate_json(response.text)
+        except ValidationError:
+            logger.exception(
+                'Failed to parse %s response for unit ids: %s',
+                resource_name,
+                unit_ids_batch,
+            )
+            return None
+
+    async def _send_request(
+        self,
+        url: str,
+        params: dict[str, str | int],
+    ) -> httpx.Response:
+        async with self.semaphore:
+            response = await self.http_client.get(url=url, params=params)
+        if (
+            is_authorization_rejected(response)
+            and self.access_token_refresher is not None
+            and await self.access_token_refresher.refresh(
+                self.http_client,
+                response,
+            )
+        ):
+            logger.info('Retrying %s with refreshed access token', url)
+            async with self.semaphore:
+                response = await self.http_client.get(url=url, params=params)
+        return response
+
+    async def _try_send_request_with_server_error_handling(
+        self,
+        url: str,
+        params: dict[str, str | int],
+        max_retries: int = 5,
+    ) -> httpx.Response | None:
+        for attempt in range(1, max_retries + 1):
+            response = await self._send_request(url=url, params=params)
+
+            if response.is_server_error:
+                logger.warning(
+                    'Server error (%s) on attempt %d/%d for params %s',
+                    response.status_code,
+                    attempt,
+                    max_retries,
+                    params,
+                )
+                if attempt < max_retries:
+                    continue
+                else:
+                    logger.error('Max retries reached')
+                    break
+
+            return response
+
+        return None
+
+
+@contextlib.asynccontextmanager
+async def get_async_dodo_is_api_gateway(
+    access_token: str,
+    timeout: int = 60,
+    max_concurrent_requests: int = 10,
+    refresh_access_token: Callable[[], Awaitable[str]] | None = None,
+) -> AsyncGenerator[AsyncDodoIsApiGateway, None]:
+    """
+    Keyword Args:
+        refresh_access_token: Called to get a new access token when
+            the API rejects the current one.
+    """
+    access_token_refresher = None
+    if refresh_access_token is not None:
+        access_token_refresher = AsyncAccessTokenRefresher(
+            refresh_access_token,
+        )
+
+    async with get_async_dodo_is_api_http_client(
+        access_token=access_token,
+        timeout=timeout,
+        max_connections=max_concurrent_requests,
+    ) as http_client:
+        yield AsyncDodoIsApiGateway(
+            http_client=http_client,
+            semaphore=asyncio.Semaphore(max_concurrent_requests),
+            access_token_refresher=access_token_refresher,
+        )
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Final
+from uuid import uuid4
+
+from redis import Redis
+
+from core.exceptions import NotFoundError
+
+
+REPORT_JOB_TTL_IN_SECONDS: Final[int] = 24 * 60 * 60
+# Upper bound of a single report creation. If the worker dies without
+# releasing the lock, the same report can be requested again after it.
+IN_FLIGHT_REPORT_JOB_TTL_IN_SECONDS: Final[int] = 10 * 60
+REPORT_JOB_KEY_PREFIX: Final[str] = 'report-jobs:'
+
+# Returns the id of the job in flight for KEYS[1] if its hash still
+# exists. Otherwise saves the new job hash KEYS[2] and takes the in-flight
+# lock for it, then returns the id of the new job ARGV[1]. Done in a
+# single step, so a concurrent request never sees the lock without the
+# job or takes over the lock of a job just created.
+CREATE_REPORT_JOB_SCRIPT: Final[str] = '''
+local in_flight_job_id = redis.call('GET', KEYS[1])
+if in_flight_job_id
+    and redis.call('EXISTS', ARGV[2] .. in_flight_job_id) == 1 then
+    return in_flight_job_id
+end
+redis.call(
+    'HSET', KEYS[2],
+    'report_type_id', ARGV[3], 'chat_id', ARGV[4], 'status', ARGV[5]
+)
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[7])
+return ARGV[1]
+'''
+
+
+class ReportJobStatus(StrEnum):
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    SUCCEEDED = 'SUCCEEDED'
+    FAILED = 'FAILED'
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ReportJob:
+    id: str
+    report_type_id: int
+    chat_id: int
+    status: ReportJobStatus
+    error_message: str | None = None
+
+
+def get_report_job_key(job_id: str) -> str:
+    return f'{REPORT_JOB_KEY_PREFIX}{job_id}'
+
+
+def get_in_flight_report_job_key(*, report_type_id: int, chat_id: int) -> str:
+    return f'report-jobs:in-flight:{report_type_id}:{chat_id}'
+
+
+def find_report_job(*, redis: Redis, job_id: str) -> ReportJob | None:
+    job_data = redis.hgetall(get_report_job_key(job_id))
+    if not job_data:
+        return None
+    return ReportJob(
+        id=job_id,
+        report_type_id=int(job_data['report_type_id']),
+        chat_id=int(job_data['chat_id']),
+        status=ReportJobStatus(job_data['status']),
+        error_message=job_data.get('error_message') or None,
+    )
+
+
+def get_report_job(*, redis: Redis, job_id: str) -> ReportJob:
+    job = find_report_job(redis=redis, job_id=job_id)
+    if job is None:
+        raise NotFoundError('Report job is not found')
+    return job
+
+
+def create_report_job(
+    *,
+    redis: Redis,
+    report_type_id: int,
+    chat_id: int,
+) -> tuple[ReportJob, bool]:
+    """
+    Register a report job unless the same report is already in flight.
+
+    Returns:
+        Job and flag whether it was created. If the same report type is
+        already being created for the chat, the existing job is returned
+        and the flag is False.
+    """
+    in_flight_key = get_in_flight_report_job_key(
+        report_type_id=report_type_id,
+        chat_id=chat_id,
+    )
+    job = ReportJob(
+        id=uuid4().hex,
+        report_type_id=report_type_id,
+        chat_id=chat_id,
+        status=ReportJobStatus.PENDING,
+    )
+
+    create_report_job_script = redis.register_script(
+        CREATE_REPORT_JOB_SCRIPT,
+    )
+    in_flight_job_id = create_report_job_script(
+        keys=[in_flight_key, get_report_job_key(job.id)],
+        args=[
+            job.id,
+            REPORT_JOB_KEY_PREFIX,
+            report_type_id,
+            chat_id,
+            job.status,
+            REPORT_JOB_TTL_IN_SECONDS,
+            IN_FLIGHT_REPORT_JOB_TTL_IN_SECONDS,
+        ],
+    )
+    if in_flight_job_id == job.id:
+        return job, True
+
+    in_flight_job = find_report_job(redis=redis, job_id=in_flight_job_id)
+    if in_flight_job is None:
+        # The job expired right after the check, nothing is in flight.
+        return create_report_job(
+            redis=redis,
+            report_type_id=report_type_id,
+            chat_id=chat_id,
+        )
+    return in_flight_job, False
+
+
+def update_report_job_status(
+    *,
+    redis: Redis,
+    job_id: str,
+    status: ReportJobStatus,
+    error_message: str | None = None,
+) -> None:
+    mapping = {'status': status}
+    if error_message is not None:
+        mapping['error_message'] = error_message
+    redis.hset(get_report_job_key(job_id), mapping=mapping)
+
+
+def release_in_flight_report_job(*, redis: Redis, job: ReportJob) -> None:
+    in_flight_key = get_in_flight_report_job_key(
+        report_type_id=job.report_type_id,
+        chat_id=job.chat_id,
+    )
+    if redis.get(in_flight_key) == job.id:
+        redis.delete(in_flight_key)
+
+
+def fail_report_job(
+    *,
+    redis: Redis,
+    job: ReportJob,
+    error_message: str,
+) -> None:
+    """Mark the job failed and let the same report be requested again."""
+    update_report_job_status(
+        redis=redis,
+        job_id=job.id,
+        status=ReportJobStatus.FAILED,
+        error_message=error_message,
+    )
+    release_in_flight_report_job(redis=redis, job=job)
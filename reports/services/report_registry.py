@@ -0,0 +1,114 @@
+from typing import TYPE_CHECKING
+
+from django.utils.module_loading import import_string
+
+from core.exceptions import NotFoundError
+
+if TYPE_CHECKING:
+    from reports.use_cases.create_report import CreateReportUseCase
+
+
+class ReportUseCaseRegistry:
+    """
+    Maps `ReportType.name` to the use case creating the report.
+
+    Use cases are registered by import path and imported only on the
+    first lookup, so the web workers don't pay for importing every
+    report use case along with the views.
+    """
+
+    def __init__(self):
+        self.__report_type_name_to_import_path: dict[str, str] = {}
+        self.__report_type_name_to_use_case_class: dict[
+            str, type['CreateReportUseCase']
+        ] = {}
+
+    def register(self, report_type_name: str, import_path: str) -> None:
+        if report_type_name in self.__report_type_name_to_import_path:
+            raise ValueError(
+                f'Report type {report_type_name} is already registered',
+            )
+        self.__report_type_name_to_import_path[report_type_name] = import_path
+
+    def is_registered(self, report_type_name: str) -> bool:
+        return report_type_name in self.__report_type_name_to_import_path
+
+    def get_report_type_names(self) -> list[str]:
+        return list(self.__report_type_name_to_import_path)
+
+    def get_import_path(self, report_type_name: str) -> str:
+        try:
+            return self.__report_type_name_to_import_path[report_type_name]
+        except KeyError:
+            raise NotFoundError(
+                f'No use case is registered for report type'
+                f' {report_type_name}',
+            )
+
+    def get_use_case_class(
+        self,
+        report_type_name: str,
+    ) -> type['CreateReportUseCase']:
+        if report_type_name not in self.__report_type_name_to_use_case_class:
+            self.__report_type_name_to_use_case_class[report_type_name] = (
+                import_string(self.get_import_path(report_type_name))
+            )
+        return self.__report_type_name_to_use_case_class[report_type_name]
+
+    def create_report(self, *, report_type_name: str, chat_id: int) -> None:
+        use_case_class = self.get_use_case_class(report_type_name)
+        use_case_class(chat_id=chat_id).execute()
+
+
+report_use_case_registry = ReportUseCaseRegistry()
+
+report_use_case_registry.register(
+    'COOKING_TIME',
+    'reports.use_cases.create_cooking_time_report'
+    '.CreateDeliveryCookingTimeReportUseCase',
+)
+report_use_case_registry.register(
+    'RESTAURANT_COOKING_TIME',
+    'reports.use_cases.create_cooking_time_report'
+    '.CreateRestaurantCookingTimeReportUseCase',
+)
+report_use_case_registry.register(
+    'KITCHEN_PERFORMANCE',
+    'reports.use_cases.create_kitchen_performance_report'
+    '.CreateKitchenPerformanceReportUseCase',
+)
+report_use_case_registry.register(
+    'DELIVERY_AWAITING_TIME',
+    'reports.use_cases.create_heated_shelf_statistics_report'
+    '.CreateHeatedShelfStatisticsReport',
+)
+report_use_case_registry.register(
+    'DELIVERY_SPEED',
+    'reports.use_cases.create_delivery_speed_report'
+    '.CreateDeliverySpeedReportUseCase',
+)
+report_use_case_registry.register(
+    'DELIVERY_PERFORMANCE',
+    'reports.use_cases.create_delivery_performance_report'
+    '.CreateDeliveryPerformanceReportUseCase',
+)
+report_use_case_registry.register(
+    'BEING_LATE_CERTIFICATES',
+    'reports.use_cases.create_late_delivery_vouchers_report'
+    '.CreateLateDeliveryVouchersReportUseCase',
+)
+report_use_case_registry.register(
+    'DAILY_REVENUE',
+    'reports.use_cases.create_daily_revenue_report'
+    '.CreateDailyRevenueReportUseCase',
+)
+report_use_case_registry.register(
+    'AWAITING_ORDERS',
+    'reports.use_cases.create_awaiting_orders_report'
+    '.CreateAwaitingOrdersReportUseCase',
+)
+report_use_case_registry.register(
+    'PRODUCTIVITY_BALANCE',
+    'reports.use_cases.create_productivity_balance_report'
+    '.CreateProductivityBalanceReportUseCase',
+)
@@ -9,6 +9,7 @@ from reports.selectors import (
     filter_report_routes_by_report_type_id,
     filter_report_routes_by_chat_id,
 )
+from reports.signals import report_routes_changed
 
 
 def create_report_routes(
@@ -25,9 +26,11 @@ def create_report_routes(
         ) for unit_id in unit_ids
     ]
     try:
-        return ReportRoute.objects.bulk_create(report_routes)
+        created_report_routes = ReportRoute.objects.bulk_create(report_routes)
     except IntegrityError:
         raise AlreadyExistsError('Unit route already exists')
+    report_routes_changed.send(sender=ReportRoute)
+    return created_report_routes
 
 
 def delete_report_routes(
@@ -44,4 +47,6 @@ def delete_report_routes(
         chat_id=chat_id,
     ).filter(unit_id__in=unit_ids)
     deleted_rows_count, _ = report_routes.delete()
+    if deleted_rows_count:
+        report_routes_changed.send(sender=ReportRoute)
     return deleted_rows_count
@@ -0,0 +1,187 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Final
+from uuid import UUID
+
+from django.conf import settings
+from redis import Redis
+
+from core.services import get_redis
+from reports.selectors import get_report_routing_table
+
+
+logger = logging.getLogger(__name__)
+
+ReportRoutingTable = dict[UUID, list[int]]
+
+VERSION_REDIS_KEY: Final[str] = 'report-routing-tables:version'
+
+
+def get_table_redis_key(*, report_type_name: str, version: int) -> str:
+    return f'report-routing-tables:{version}:{report_type_name}'
+
+
+def serialize_routing_table(routing_table: ReportRoutingTable) -> str:
+    return json.dumps(
+        {unit_uuid.hex: chat_ids for unit_uuid, chat_ids in routing_table.items()},
+    )
+
+
+def deserialize_routing_table(value: str) -> ReportRoutingTable:
+    return {
+        UUID(unit_uuid): chat_ids
+        for unit_uuid, chat_ids in json.loads(value).items()
+    }
+
+
+@dataclass(slots=True)
+class ReportRoutingTableCacheStats:
+    hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CachedReportRoutingTable:
+    version: int
+    expires_at: float
+    routing_table: ReportRoutingTable
+
+
+class ReportRoutingTableCache:
+    """
+    Versioned in-process cache of report routing tables.
+
+    Any change of report routes bumps the version, which drops all
+    cached tables. With Redis enabled the version is shared by all
+    processes and loaded tables are shared through Redis as well, so only
+    the first process after a change reads routes from Postgres.
+    Without Redis the version is local to the process and other
+    processes see the change after `ttl_in_seconds`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_in_seconds: int,
+        redis_factory: Callable[[], Redis] | None = None,
+    ):
+        self.__ttl_in_seconds = ttl_in_seconds
+        self.__redis_factory = redis_factory
+        self.__redis: Redis | None = None
+        self.__local_version = 0
+        self.__report_type_name_to_table: dict[
+            str, CachedReportRoutingTable
+        ] = {}
+        self.__lock = threading.Lock()
+        self.stats = ReportRoutingTableCacheStats()
+
+    @property
+    def redis(self) -> Redis | None:
+        if self.__redis is None and self.__redis_factory is not None:
+            self.__redis = self.__redis_factory()
+        return self.__redis
+
+    def get_version(self) -> int:
+        if self.redis is None:
+            return self.__local_version
+        return int(self.redis.get(VERSION_REDIS_KEY) or 0)
+
+    def get(self, report_type_name: str) -> ReportRoutingTable:
+        version = self.get_version()
+        now = time.monotonic()
+
+        cached = self.__report_type_name_to_table.get(report_type_name)
+        if (
+            cached is not None
+            and cached.version == version
+            and cached.expires_at > now
+        ):
+            self.stats.hits += 1
+            return cached.routing_table
+
+        routing_table = self.__get_from_redis(
+            report_type_name=report_type_name,
+            version=version,
+        )
+        if routing_table is not None:
+            self.stats.redis_hits += 1
+        else:
+            self.stats.misses += 1
+            routing_table = get_report_routing_table(report_type_name)
+            self.__set_to_redis(
+                report_type_name=report_type_name,
+                version=version,
+                routing_table=routing_table,
+            )
+
+        with self.__lock:
+            self.__report_type_name_to_table[report_type_name] = (
+                CachedReportRoutingTable(
+                    version=version,
+                    expires_at=now + self.__ttl_in_seconds,
+                    routing_table=routing_table,
+                )
+            )
+        logger.debug(
+            'Report routing table %s loaded (version %d). Stats: %s',
+            report_type_name,
+            version,
+            self.stats,
+        )
+        return routing_table
+
+    def invalidate(self) -> None:
+        with self.__lock:
+            self.__local_version += 1
+            self.__report_type_name_to_table.clear()
+        if self.redis is not None:
+            self.redis.incr(VERSION_REDIS_KEY)
+
+    def __get_from_redis(
+        self,
+        *,
+        report_type_name: str,
+        version: int,
+    ) -> ReportRoutingTable | None:
+        if self.redis is None:
+            return None
+        value = self.redis.get(
+            get_table_redis_key(
+                report_type_name=report_type_name,
+                version=version,
+            ),
+        )
+        if value is None:
+            return None
+        return deserialize_routing_table(value)
+
+    def __set_to_redis(
+        self,
+        *,
+        report_type_name: str,
+        version: int,
+        routing_table: ReportRoutingTable,
+    ) -> None:
+        if self.redis is None:
+            return
+        self.redis.set(
+            get_table_redis_key(
+                report_type_name=report_type_name,
+                version=version,
+            ),
+            serialize_routing_table(routing_table),
+            ex=self.__ttl_in_seconds,
+        )
+
+
+report_routing_table_cache = ReportRoutingTableCache(
+    ttl_in_seconds=settings.REPORT_ROUTING_TABLE_CACHE_TTL_IN_SECONDS,
+    redis_factory=(
+        get_redis if settings.REPORT_ROUTING_TABLE_CACHE_USE_REDIS else None
+    ),
+)
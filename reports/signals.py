@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from reports.models.report_routes import ReportRoute
+from reports.services.report_routing_table import report_routing_table_cache
+from telegram.models import TelegramChat
+from units.models import Unit
+
+
+# Sent by services changing report routes in bulk, since bulk operations
+# don't send model signals.
+report_routes_changed = Signal()
+
+
+# Routing tables map unit uuids to chat ids, so changing either of them
+# changes the routes too.
+@receiver(report_routes_changed)
+@receiver(post_save, sender=ReportRoute)
+@receiver(post_delete, sender=ReportRoute)
+@receiver(post_save, sender=TelegramChat)
+@receiver(post_delete, sender=TelegramChat)
+@receiver(post_save, sender=Unit)
+@receiver(post_delete, sender=Unit)
+def invalidate_report_routing_table_cache(sender, **kwargs) -> None:
+    transaction.on_commit(report_routing_table_cache.invalidate)
@@ -0,0 +1,54 @@
+import logging
+
+from celery import shared_task
+
+from core.services import get_redis
+from reports.selectors import get_report_type_by_id
+from reports.services.report_jobs import (
+    ReportJobStatus,
+    find_report_job,
+    release_in_flight_report_job,
+    update_report_job_status,
+)
+from reports.services.report_registry import report_use_case_registry
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def create_report(job_id: str) -> None:
+    redis = get_redis()
+
+    job = find_report_job(redis=redis, job_id=job_id)
+    if job is None:
+        logger.warning('Report job %s is not found or expired', job_id)
+        return
+
+    update_report_job_status(
+        redis=redis,
+        job_id=job.id,
+        status=ReportJobStatus.RUNNING,
+    )
+    try:
+        report_type = get_report_type_by_id(job.report_type_id)
+        report_use_case_registry.create_report(
+            report_type_name=report_type.name,
+            chat_id=job.chat_id,
+        )
+    except Exception as error:
+        update_report_job_status(
+            redis=redis,
+            job_id=job.id,
+            status=ReportJobStatus.FAILED,
+            error_message=str(error),
+        )
+        raise
+    else:
+        update_report_job_status(
+            redis=redis,
+            job_id=job.id,
+            status=ReportJobStatus.SUCCEEDED,
+        )
+    finally:
+        release_in_flight_report_job(redis=redis, job=job)
@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+
+import httpx
+from django.test import SimpleTestCase
+
+from reports.services.gateways.dodo_is_api import (
+    AsyncAccessTokenRefresher,
+    AsyncDodoIsApiGateway,
+    AsyncDodoIsApiHttpClient,
+    DodoIsApiGateway,
+    DodoIsApiHttpClient,
+)
+
+
+def get_inventory_stock_data(*, unit_id: uuid.UUID) -> dict:
+    return {
+        'id': str(uuid.uuid4()),
+        'name': 'Cheese',
+        'unitId': str(unit_id),
+        'categoryName': 'Ingredient',
+        'quantity': 1.5,
+        'measurementUnit': 'Kilogram',
+        'balanceInMoney': 100,
+        'currency': 'RUB',
+        'avgWeekdayExpense': 1,
+        'avgWeekendExpense': 1,
+        'daysUntilBalanceRunsOut': 2,
+        'calculatedAt': '2026-10-18T10:00:00',
+    }
+
+
+class GetInventoryStocksByUnitsTests(SimpleTestCase):
+
+    def test_unit_request_timeout_loses_only_its_stocks(self):
+        timed_out_unit_id, *other_unit_ids = [uuid.uuid4() for _ in range(3)]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            unit_ids = request.url.params['units'].split(',')
+            if str(timed_out_unit_id).replace('-', '') in unit_ids:
+                raise httpx.ConnectTimeout('Timed out', request=request)
+            return httpx.Response(
+                200,
+                json={
+                    'stocks': [
+                        get_inventory_stock_data(unit_id=uuid.UUID(unit_id))
+                        for unit_id in unit_ids
+                    ],
+                    'isEndOfListReached': True,
+                },
+            )
+
+        with httpx.Client(
+            transport=httpx.MockTransport(handler),
+            base_url='https://api.dodois.io/dodopizza/',
+        ) as http_client:
+            gateway = DodoIsApiGateway(
+                http_client=DodoIsApiHttpClient(http_client),
+            )
+            with self.assertLogs(
+                'reports.services.gateways.dodo_is_api',
+                level='ERROR',
+            ):
+                unit_id_to_items = gateway.get_inventory_stocks_by_units(
+                    unit_ids=[timed_out_unit_id, *other_unit_ids],
+                )
+
+        self.assertEqual(set(unit_id_to_items), set(other_unit_ids))
+        for unit_id in other_unit_ids:
+            self.assertEqual(len(unit_id_to_items[unit_id]), 1)
+
+
+class AsyncDodoIsApiGatewayTests(SimpleTestCase):
+
+    def test_failed_access_token_refresh_skips_batches(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(401, request=request)
+
+        async def refresh_access_token() -> str:
+            request = httpx.Request('POST', 'https://auth.dodois.io/')
+            raise httpx.HTTPStatusError(
+                'Invalid refresh token',
+                request=request,
+                response=httpx.Response(400, request=request),
+            )
+
+        async def get_inventory_stocks() -> list:
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler),
+                base_url='https://api.dodois.io/dodopizza/',
+                headers={'Authorization': 'Bearer expired'},
+            ) as http_client:
+                gateway = AsyncDodoIsApiGateway(
+                    http_client=AsyncDodoIsApiHttpClient(http_client),
+                    semaphore=asyncio.Semaphore(10),
+                    access_token_refresher=AsyncAccessTokenRefresher(
+                        refresh_access_token,
+                    ),
+                )
+                return await gateway.get_inventory_stocks(
+                    unit_ids=[uuid.uuid4() for _ in range(60)],
+                )
+
+        with self.assertLogs(
+            'reports.services.gateways.dodo_is_api',
+            level='ERROR',
+        ) as logs:
+            inventory_stocks = asyncio.run(get_inventory_stocks())
+
+        self.assertEqual(inventory_stocks, [])
+        self.assertIn(
+            'Could not refresh rejected access token',
+            '\n'.join(logs.output),
+        )
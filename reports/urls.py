@@ -1,6 +1,6 @@
 from django.urls import path
 
-from reports.views.report_create import ReportCreateApi
+from reports.views.report_create import ReportCreateApi, ReportJobRetrieveApi
 from reports.views.report_routes import (
     ReportRoutesChatIdsListApi,
     ReportRoutesCreateDeleteApi,
@@ -14,6 +14,7 @@ from reports.views.report_types import (
 
 urlpatterns = [
     path('reports/', ReportCreateApi.as_view()),
+    path('reports/jobs/<str:job_id>/', ReportJobRetrieveApi.as_view()),
     path('report-types/', ReportTypeListApi.as_view()),
     path(
         'report-types/names/<str:report_type_name>/',
@@ -2,14 +2,13 @@ from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
 from accounts.models import AccountTokens
-from accounts.services.crypt import decrypt_string
 from reports.services.filters.staff_members import (
     filter_birthdays_by_full_name,
 )
 from reports.services.formatters.staff_members import (
     format_birthday_congratulations,
 )
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
+from reports.services.account_gateways import get_account_dodo_is_api_gateway
 from reports.services.period import Period
 from telegram.services import (
     batch_create_telegram_messages,
@@ -31,10 +30,8 @@ class CreateEmployeeBirthdaysReport:
             )
             unit_ids = {unit.uuid for unit in units}
 
-            access_token = decrypt_string(account_token.encrypted_access_token)
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
+            with get_account_dodo_is_api_gateway(
+                account_token,
             ) as dodo_is_api_gateway:
                 birthdays = dodo_is_api_gateway.get_staff_members_birthdays(
                     day_from=today.start.day,
@@ -3,12 +3,11 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
-from accounts.services.crypt import decrypt_string
+from reports.services.dodo_is_api_fetcher import fetch_for_accounts
 from reports.services.formatters.delivery import (
     format_restaurant_cooking_time_report, format_delivery_cooking_time_report,
 )
 from reports.services.gateways.dodo_is_api import (
-    get_dodo_is_api_gateway,
     OrdersHandoverStatisticsRequestParamSalesChannel,
     UnitOrdersHandoverStatistics,
 )
@@ -37,23 +36,28 @@ class CreateCookingTimeReportUseCase(CreateReportUseCase):
 
     def execute(self) -> None:
         today = Period.today_to_this_time(self.timezone)
-        all_units = []
-        result = []
-        for account_token, units in self.get_account_tokens_and_units():
-            all_units += units
-            access_token = decrypt_string(account_token.encrypted_access_token)
 
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
-            ) as dodo_is_api_gateway:
-                result += dodo_is_api_gateway.get_orders_handover_statistics(
+        account_tokens_and_units = self.get_account_tokens_and_units()
+        all_units = [
+            unit for _, units in account_tokens_and_units for unit in units
+        ]
+
+        results = fetch_for_accounts(
+            account_tokens_and_units,
+            orders_handover_statistics=lambda gateway, unit_ids: (
+                gateway.get_orders_handover_statistics(
                     date_from=today.start,
                     date_to=today.end,
-                    unit_ids={unit.uuid for unit in units},
+                    unit_ids=unit_ids,
                     sales_channels=self.get_sales_channels(),
                 )
+            ),
+        )
 
-        text = self.format_report(all_units, result)
+        text = self.format_report(
+            all_units,
+            results['orders_handover_statistics'],
+        )
         batch_create_telegram_messages(
             chat_ids=[self.chat_id],
             text=text,
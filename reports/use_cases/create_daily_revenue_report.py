@@ -1,12 +1,11 @@
 from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
-from accounts.services.crypt import decrypt_string
+from reports.services.dodo_is_api_fetcher import fetch_for_accounts
 from reports.services.formatters.sales import (
     group_sales,
     format_sales_statistics,
 )
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
 from reports.services.period import Period
 from reports.use_cases.create_report import CreateReportUseCase
 from telegram.services import batch_create_telegram_messages
@@ -21,35 +20,33 @@ class CreateDailyRevenueReportUseCase(CreateReportUseCase):
         today = Period.today_to_this_time(self.timezone)
         week_before = Period.week_before_to_this_time(self.timezone)
 
-        today_sales = []
-        week_before_sales = []
+        account_tokens_and_units = self.get_account_tokens_and_units()
+        all_units = [
+            unit for _, units in account_tokens_and_units for unit in units
+        ]
 
-        all_units = []
-
-        for account_token, units in self.get_account_tokens_and_units():
-            all_units += units
-            unit_ids = {unit.uuid for unit in units}
-
-            access_token = decrypt_string(account_token.encrypted_access_token)
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
-            ) as dodo_is_api_gateway:
-                today_sales += dodo_is_api_gateway.get_units_sales_for_period(
+        results = fetch_for_accounts(
+            account_tokens_and_units,
+            today_sales=lambda gateway, unit_ids: (
+                gateway.get_units_sales_for_period(
                     date_from=today.start,
                     date_to=today.end,
                     unit_ids=unit_ids,
                 )
-                week_before_sales += dodo_is_api_gateway.get_units_sales_for_period(
+            ),
+            week_before_sales=lambda gateway, unit_ids: (
+                gateway.get_units_sales_for_period(
                     date_from=week_before.start,
                     date_to=week_before.end,
                     unit_ids=unit_ids,
                 )
+            ),
+        )
 
         sales_statistics = group_sales(
             units=all_units,
-            units_today_sales=today_sales,
-            units_week_before_sales=week_before_sales,
+            units_today_sales=results['today_sales'],
+            units_week_before_sales=results['week_before_sales'],
         )
         text = format_sales_statistics(sales_statistics)
         batch_create_telegram_messages(
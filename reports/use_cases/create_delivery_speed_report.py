@@ -1,9 +1,8 @@
 from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
-from accounts.services.crypt import decrypt_string
+from reports.services.dodo_is_api_fetcher import fetch_for_accounts
 from reports.services.formatters.delivery import format_delivery_speed_report
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
 from reports.services.period import Period
 from reports.use_cases.create_report import CreateReportUseCase
 from telegram.services import batch_create_telegram_messages
@@ -17,20 +16,18 @@ class CreateDeliverySpeedReportUseCase(CreateReportUseCase):
     def execute(self) -> None:
         today = Period.today_to_this_time(self.timezone)
 
-        delivery_statistics = []
-        for account_token, units in self.get_account_tokens_and_units():
-            access_token = decrypt_string(account_token.encrypted_access_token)
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
-            ) as dodo_is_api_gateway:
-                delivery_statistics += dodo_is_api_gateway.get_delivery_statistics(
+        results = fetch_for_accounts(
+            self.get_account_tokens_and_units(),
+            delivery_statistics=lambda gateway, unit_ids: (
+                gateway.get_delivery_statistics(
                     date_from=today.start,
                     date_to=today.end,
-                    unit_ids={unit.uuid for unit in units},
+                    unit_ids=unit_ids,
                 )
+            ),
+        )
 
-        text = format_delivery_speed_report(delivery_statistics)
+        text = format_delivery_speed_report(results['delivery_statistics'])
         batch_create_telegram_messages(
             chat_ids=[self.chat_id],
             text=text,
@@ -3,14 +3,15 @@ from zoneinfo import ZoneInfo
 from redis import Redis
 
 from accounts.models import AccountTokens
-from accounts.services.crypt import decrypt_string
 from core.services import get_redis
-from reports.models.report_routes import ReportRoute
 from reports.services.formatters.feedbacks import format_feedback
+from reports.services.account_gateways import get_account_dodo_is_api_gateway
 from reports.services.gateways.dodo_is_api import (
-    get_dodo_is_api_gateway,
     OrderFeedback,
 )
+from reports.services.report_routing_table import (
+    report_routing_table_cache,
+)
 from telegram.services import batch_create_telegram_messages
 from units.models import Unit
 
@@ -46,6 +47,7 @@ class CreateFeedbacksReport:
         accounts_tokens = AccountTokens.objects.select_related(
             'account',
         ).all()
+        unit_uuid_to_chat_ids = report_routing_table_cache.get('FEEDBACKS')
 
         for account_token in accounts_tokens:
             units = Unit.objects.filter(
@@ -54,12 +56,8 @@ class CreateFeedbacksReport:
             unit_ids = {unit.uuid for unit in units}
             unit_id_to_name = {unit.uuid: unit.name for unit in units}
 
-            access_token = decrypt_string(
-                account_token.encrypted_access_token,
-            )
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
+            with get_account_dodo_is_api_gateway(
+                account_token,
             ) as dodo_is_api_gateway:
                 feedbacks = dodo_is_api_gateway.get_recent_feedbacks(
                     unit_ids=unit_ids,
@@ -74,14 +72,7 @@ class CreateFeedbacksReport:
 
                 unit_name = unit_id_to_name.get(feedback.unit_id, '?')
                 text = format_feedback(feedback, unit_name, self.timezone)
-                chat_ids = (
-                    ReportRoute.objects
-                    .filter(
-                        report_type__name='FEEDBACKS',
-                        unit__uuid=feedback.unit_id,
-                    )
-                    .values_list('telegram_chat__chat_id', flat=True)
-                )
+                chat_ids = unit_uuid_to_chat_ids.get(feedback.unit_id, [])
                 batch_create_telegram_messages(
                     chat_ids=chat_ids,
                     text=text,
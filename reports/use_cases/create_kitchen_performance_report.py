@@ -1,10 +1,9 @@
 from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
-from accounts.services.crypt import decrypt_string
+from reports.services.dodo_is_api_fetcher import fetch_for_accounts
 from reports.services.formatters.sales import \
     format_production_performance_statistics
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
 from reports.services.period import Period
 from reports.use_cases.create_report import CreateReportUseCase
 from telegram.services import batch_create_telegram_messages
@@ -18,34 +17,32 @@ class CreateKitchenPerformanceReportUseCase(CreateReportUseCase):
         today = Period.today_to_this_time(self.timezone).rounded_to_upper_hour()
         week_before = Period.week_before_to_this_time(self.timezone).rounded_to_upper_hour()
 
-        today_data = []
-        week_before_data = []
+        account_tokens_and_units = self.get_account_tokens_and_units()
+        all_units = [
+            unit for _, units in account_tokens_and_units for unit in units
+        ]
 
-        all_units = []
-
-        for account_token, units in self.get_account_tokens_and_units():
-            all_units += units
-            unit_ids = {unit.uuid for unit in units}
-
-            access_token = decrypt_string(account_token.encrypted_access_token)
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
-            ) as dodo_is_api_gateway:
-                today_data += dodo_is_api_gateway.get_production_productivity(
+        results = fetch_for_accounts(
+            account_tokens_and_units,
+            today=lambda gateway, unit_ids: (
+                gateway.get_production_productivity(
                     date_from=today.start,
                     date_to=today.end,
                     unit_ids=unit_ids,
                 )
-                week_before_data += dodo_is_api_gateway.get_production_productivity(
+            ),
+            week_before=lambda gateway, unit_ids: (
+                gateway.get_production_productivity(
                     date_from=week_before.start,
                     date_to=week_before.end,
                     unit_ids=unit_ids,
                 )
+            ),
+        )
 
         text = format_production_performance_statistics(
-            today=today_data,
-            week_before=week_before_data,
+            today=results['today'],
+            week_before=results['week_before'],
             units=all_units,
         )
         batch_create_telegram_messages(
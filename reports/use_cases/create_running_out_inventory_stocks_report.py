@@ -1,9 +1,6 @@
-import itertools
+import logging
 from dataclasses import dataclass
 
-from accounts.models import AccountTokens
-from accounts.services.crypt import decrypt_string
-from reports.models.report_routes import ReportRoute
 from reports.services.filters.inventory_stocks import (
     filter_relevant_items,
     filter_running_out_stock_items, UnitInventoryStocks,
@@ -11,72 +8,62 @@ from reports.services.filters.inventory_stocks import (
 from reports.services.formatters.inventory_stocks import (
     format_running_out_stock_items,
 )
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
+from reports.services.report_routing_table import (
+    report_routing_table_cache,
+)
+from snapshots.services import get_inventory_stocks
 from telegram.services import batch_create_telegram_messages
 from units.models import Unit
 
 
+logger = logging.getLogger(__name__)
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class CreateRunningOutInventoryStocksReportUseCase:
 
     def execute(self) -> None:
-        accounts_tokens = AccountTokens.objects.select_related('account').all()
-
-        for account_token in accounts_tokens:
-            units = Unit.objects.filter(
-                dodo_is_api_account_name=account_token.account.name,
-            )
-            unit_ids = {unit.uuid for unit in units}
-            unit_id_to_name = {unit.uuid: unit.name for unit in units}
-
-            access_token = decrypt_string(account_token.encrypted_access_token)
+        unit_uuid_to_chat_ids = report_routing_table_cache.get(
+            'INVENTORY_STOCKS',
+        )
+        units = Unit.objects.all()
+        unit_id_to_name = {unit.uuid: unit.name for unit in units}
 
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
-            ) as dodo_is_api_gateway:
-                for unit_id in unit_ids:
-                    try:
-                        inventory_stocks = list(
-                            itertools.chain.from_iterable(
-                                dodo_is_api_gateway.get_inventory_stocks(
-                                    unit_ids=[unit_id],
-                                ),
-                            ),
-                        )
-                        relevant_inventory_stocks = filter_relevant_items(
-                            inventory_stocks,
-                        )
+        inventory_stocks = get_inventory_stocks()
+        for unit_id, items in inventory_stocks.unit_id_to_items.items():
+            try:
+                relevant_inventory_stocks = filter_relevant_items(items)
 
-                        running_out_stocks = filter_running_out_stock_items(
-                            items=relevant_inventory_stocks,
-                            threshold=1,
-                        )
-                        unit_stocks = UnitInventoryStocks(
-                            unit_id=unit_id,
-                            items=running_out_stocks,
-                        )
+                running_out_stocks = filter_running_out_stock_items(
+                    items=relevant_inventory_stocks,
+                    threshold=1,
+                )
+                unit_stocks = UnitInventoryStocks(
+                    unit_id=unit_id,
+                    items=running_out_stocks,
+                )
 
-                        unit_name = unit_id_to_name.get(
-                            unit_stocks.unit_id, '?',
-                        )
+                unit_name = unit_id_to_name.get(
+                    unit_stocks.unit_id, '?',
+                )
 
-                        running_out_stock_items_text = format_running_out_stock_items(
-                            unit_name=unit_name,
-                            items=unit_stocks.items,
-                        )
+                running_out_stock_items_text = format_running_out_stock_items(
+                    unit_name=unit_name,
+                    items=unit_stocks.items,
+                )
 
-                        chat_ids = (
-                            ReportRoute.objects
-                            .filter(
-                                report_type__name='INVENTORY_STOCKS',
-                                unit__uuid=unit_stocks.unit_id,
-                            )
-                            .values_list('telegram_chat__chat_id', flat=True)
-                        )
+                chat_ids = unit_uuid_to_chat_ids.get(
+                    unit_stocks.unit_id,
+                    [],
+                )
 
-                        batch_create_telegram_messages(
-                            chat_ids=chat_ids,
-                            text=running_out_stock_items_text,
-                        )
-                    except Exception:
-                        pass
+                batch_create_telegram_messages(
+                    chat_ids=chat_ids,
+                    text=running_out_stock_items_text,
+                )
+            except Exception:
+                logger.exception(
+                    'Failed to create running out inventory stocks'
+                    ' report for unit %s',
+                    unit_id,
+                )
@@ -5,19 +5,20 @@ from zoneinfo import ZoneInfo
 from redis import Redis
 
 from accounts.models import AccountTokens
-from accounts.services.crypt import decrypt_string
 from core.services import get_redis
-from reports.models.report_routes import ReportRoute
 from reports.services.filters.stop_sales import filter_not_ended_stop_sales
 from reports.services.formatters.stop_sales import (
     group_by_unit_id,
     format_stop_sales_by_ingredients, group_by_reason,
 )
+from reports.services.account_gateways import get_account_dodo_is_api_gateway
 from reports.services.gateways.dodo_is_api import (
-    get_dodo_is_api_gateway,
     StopSaleByIngredient,
 )
 from reports.services.period import Period
+from reports.services.report_routing_table import (
+    report_routing_table_cache,
+)
 from telegram.services import batch_create_telegram_messages
 from units.models import Unit
 
@@ -48,6 +49,9 @@ class CreateStopSalesByNewIngredientsReport:
 
     def execute(self) -> None:
         accounts_tokens = AccountTokens.objects.select_related('account').all()
+        unit_uuid_to_chat_ids = report_routing_table_cache.get(
+            'INGREDIENTS_STOP_SALES',
+        )
         today = Period.today_to_this_time(self.timezone)
 
         new_stop_sales_filter = NewStopSalesFilter(get_redis())
@@ -59,10 +63,8 @@ class CreateStopSalesByNewIngredientsReport:
             unit_ids = {unit.uuid for unit in units}
             unit_id_to_name = {unit.uuid: unit.name for unit in units}
 
-            access_token = decrypt_string(account_token.encrypted_access_token)
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
+            with get_account_dodo_is_api_gateway(
+                account_token,
             ) as dodo_is_api_gateway:
                 stop_sales = dodo_is_api_gateway.get_stop_sales_by_ingredients(
                     unit_ids=unit_ids,
@@ -85,13 +87,9 @@ class CreateStopSalesByNewIngredientsReport:
                     timezone=self.timezone,
                 )
 
-                chat_ids = (
-                    ReportRoute.objects
-                    .filter(
-                        report_type__name='INGREDIENTS_STOP_SALES',
-                        unit__uuid=unit_stop_sales.unit_id,
-                    )
-                    .values_list('telegram_chat__chat_id', flat=True)
+                chat_ids = unit_uuid_to_chat_ids.get(
+                    unit_stop_sales.unit_id,
+                    [],
                 )
                 batch_create_telegram_messages(
                     chat_ids=chat_ids,
@@ -2,16 +2,17 @@ from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
 from accounts.models import AccountTokens
-from accounts.services.crypt import decrypt_string
-from reports.models.report_routes import ReportRoute
 from reports.services.filters.stop_sales import (
     filter_stop_sales_by_sales_channels,
 )
 from reports.services.formatters.stop_sales import (
     format_stop_sale_by_sales_channel,
 )
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
+from reports.services.account_gateways import get_account_dodo_is_api_gateway
 from reports.services.period import Period
+from reports.services.report_routing_table import (
+    report_routing_table_cache,
+)
 from telegram.services import batch_create_telegram_messages
 from units.models import Unit
 
@@ -22,6 +23,9 @@ class CreateStopSalesBySalesChannelsReport:
 
     def execute(self) -> None:
         accounts_tokens = AccountTokens.objects.select_related('account').all()
+        unit_uuid_to_chat_ids = report_routing_table_cache.get(
+            'PIZZERIA_STOP_SALES',
+        )
         today = Period.today_to_this_time(self.timezone)
 
         for account_token in accounts_tokens:
@@ -30,10 +34,8 @@ class CreateStopSalesBySalesChannelsReport:
             )
             unit_ids = {unit.uuid for unit in units}
 
-            access_token = decrypt_string(account_token.encrypted_access_token)
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
+            with get_account_dodo_is_api_gateway(
+                account_token,
             ) as dodo_is_api_gateway:
                 stop_sales = dodo_is_api_gateway.get_stop_sales_by_sales_channels(
                     unit_ids=unit_ids,
@@ -49,14 +51,7 @@ class CreateStopSalesBySalesChannelsReport:
                     timezone=self.timezone,
                 )
 
-                chat_ids = (
-                    ReportRoute.objects
-                    .filter(
-                        report_type__name='PIZZERIA_STOP_SALES',
-                        unit__uuid=stop_sale.unit_id,
-                    )
-                    .values_list('telegram_chat__chat_id', flat=True)
-                )
+                chat_ids = unit_uuid_to_chat_ids.get(stop_sale.unit_id, [])
                 batch_create_telegram_messages(
                     chat_ids=chat_ids,
                     text=text,
@@ -2,15 +2,16 @@ from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
 from accounts.models import AccountTokens
-from accounts.services.crypt import decrypt_string
-from reports.models.report_routes import ReportRoute
 from reports.services.filters.stop_sales import filter_not_ended_stop_sales
 from reports.services.formatters.stop_sales import (
     format_stop_sales_by_sectors,
     group_by_unit_id,
 )
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
+from reports.services.account_gateways import get_account_dodo_is_api_gateway
 from reports.services.period import Period
+from reports.services.report_routing_table import (
+    report_routing_table_cache,
+)
 from telegram.services import batch_create_telegram_messages
 from units.models import Unit
 
@@ -21,6 +22,9 @@ class CreateStopSalesBySectorsReport:
 
     def execute(self) -> None:
         accounts_tokens = AccountTokens.objects.select_related('account').all()
+        unit_uuid_to_chat_ids = report_routing_table_cache.get(
+            'SECTOR_STOP_SALES',
+        )
         today = Period.today_to_this_time(self.timezone)
 
         for account_token in accounts_tokens:
@@ -30,10 +34,8 @@ class CreateStopSalesBySectorsReport:
             unit_ids = {unit.uuid for unit in units}
             unit_id_to_name = {unit.uuid: unit.name for unit in units}
 
-            access_token = decrypt_string(account_token.encrypted_access_token)
-
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
+            with get_account_dodo_is_api_gateway(
+                account_token,
             ) as dodo_is_api_gateway:
                 stop_sales = dodo_is_api_gateway.get_stop_sales_by_sectors(
                     unit_ids=unit_ids,
@@ -53,13 +55,9 @@ class CreateStopSalesBySectorsReport:
                     timezone=self.timezone,
                 )
 
-                chat_ids = (
-                    ReportRoute.objects
-                    .filter(
-                        report_type__name='SECTOR_STOP_SALES',
-                        unit__uuid=unit_stop_sales.unit_id,
-                    )
-                    .values_list('telegram_chat__chat_id', flat=True)
+                chat_ids = unit_uuid_to_chat_ids.get(
+                    unit_stop_sales.unit_id,
+                    [],
                 )
                 batch_create_telegram_messages(
                     chat_ids=chat_ids,
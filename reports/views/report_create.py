@@ -5,27 +5,16 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from reports.use_cases.create_awaiting_orders_report import \
-    CreateAwaitingOrdersReportUseCase
-from reports.use_cases.create_cooking_time_report import \
-    (
-    CreateDeliveryCookingTimeReportUseCase,
-    CreateRestaurantCookingTimeReportUseCase,
+from core.exceptions import NotFoundError
+from core.services import get_redis
+from reports.selectors import get_report_type_by_id
+from reports.services.report_jobs import (
+    create_report_job,
+    fail_report_job,
+    get_report_job,
 )
-from reports.use_cases.create_daily_revenue_report import \
-    CreateDailyRevenueReportUseCase
-from reports.use_cases.create_delivery_performance_report import \
-    CreateDeliveryPerformanceReportUseCase
-from reports.use_cases.create_delivery_speed_report import \
-    CreateDeliverySpeedReportUseCase
-from reports.use_cases.create_heated_shelf_statistics_report import \
-    CreateHeatedShelfStatisticsReport
-from reports.use_cases.create_kitchen_performance_report import \
-    CreateKitchenPerformanceReportUseCase
-from reports.use_cases.create_late_delivery_vouchers_report import \
-    CreateLateDeliveryVouchersReportUseCase
-from reports.use_cases.create_productivity_balance_report import \
-    CreateProductivityBalanceReportUseCase
+from reports.services.report_registry import report_use_case_registry
+from reports.tasks import create_report
 
 
 class ReportCreateInputSerializer(serializers.Serializer):
@@ -33,6 +22,14 @@ class ReportCreateInputSerializer(serializers.Serializer):
     chat_id = serializers.IntegerField()
 
 
+class ReportJobOutputSerializer(serializers.Serializer):
+    job_id = serializers.CharField(source='id')
+    report_type_id = serializers.IntegerField()
+    chat_id = serializers.IntegerField()
+    status = serializers.CharField()
+    error_message = serializers.CharField(allow_null=True)
+
+
 class RequestData(TypedDict):
     report_type_id: int
     chat_id: int
@@ -45,47 +42,37 @@ class ReportCreateApi(APIView):
         serializer.is_valid(raise_exception=True)
         serialized_data: RequestData = serializer.data
 
-        report_type_id = int(serialized_data['report_type_id'])
-
-        if report_type_id == 17:
-            CreateDailyRevenueReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 10:
-            CreateDeliveryCookingTimeReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 11:
-            CreateRestaurantCookingTimeReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 12:
-            CreateKitchenPerformanceReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 13:
-            CreateHeatedShelfStatisticsReport(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 14:
-            CreateDeliverySpeedReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 15:
-            CreateDeliveryPerformanceReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 16:
-            CreateLateDeliveryVouchersReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 18:
-            CreateAwaitingOrdersReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-        elif report_type_id == 20:
-            CreateProductivityBalanceReportUseCase(
-                chat_id=serialized_data['chat_id'],
-            ).execute()
-
-        return Response(status=status.HTTP_202_ACCEPTED)
+        report_type = get_report_type_by_id(
+            int(serialized_data['report_type_id']),
+        )
+        if not report_use_case_registry.is_registered(report_type.name):
+            raise NotFoundError('Report type can not be created on demand')
+
+        redis = get_redis()
+        job, is_created = create_report_job(
+            redis=redis,
+            report_type_id=report_type.id,
+            chat_id=int(serialized_data['chat_id']),
+        )
+        if is_created:
+            try:
+                create_report.delay(job_id=job.id)
+            except Exception as error:
+                fail_report_job(
+                    redis=redis,
+                    job=job,
+                    error_message=f'Could not enqueue the report: {error}',
+                )
+                raise
+
+        return Response(
+            ReportJobOutputSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ReportJobRetrieveApi(APIView):
+
+    def get(self, request: Request, job_id: str) -> Response:
+        job = get_report_job(redis=get_redis(), job_id=job_id)
+        return Response(ReportJobOutputSerializer(job).data)
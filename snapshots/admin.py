@@ -1,8 +1,23 @@
 from django.contrib import admin
 
-from snapshots.models import DodoIsApiResponseSnapshot
+from snapshots.models import (
+    DodoIsApiResponseSnapshot,
+    InventoryStockItemDefinition,
+    InventoryStocksSnapshot,
+)
 
 
 @admin.register(DodoIsApiResponseSnapshot)
 class DodoIsApiResponseSnapshotAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
+
+
+@admin.register(InventoryStocksSnapshot)
+class InventoryStocksSnapshotAdmin(admin.ModelAdmin):
+    readonly_fields = ('created_at',)
+
+
+@admin.register(InventoryStockItemDefinition)
+class InventoryStockItemDefinitionAdmin(admin.ModelAdmin):
+    list_display = ('name', 'category_name', 'measurement_unit')
+    search_fields = ('name',)
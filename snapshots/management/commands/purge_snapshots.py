@@ -0,0 +1,42 @@
+from django.core.management import BaseCommand
+
+from snapshots.models import DodoIsApiResponseSnapshot
+from snapshots.use_cases.purge_snapshots import PurgeSnapshotsUseCase
+
+
+class Command(BaseCommand):
+    help = 'Delete old snapshots in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Keep snapshots created within this count of days',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Count of snapshots deleted by one query',
+        )
+        parser.add_argument(
+            '--kind',
+            choices=DodoIsApiResponseSnapshot.Kind.values,
+            help='Purge only snapshots of this kind',
+        )
+
+    def handle(self, *args, **options):
+        kind = options['kind']
+        if kind is not None:
+            kind = DodoIsApiResponseSnapshot.Kind(kind)
+        purged_snapshots_count = PurgeSnapshotsUseCase(
+            retention_in_days=options['days'],
+            batch_size=options['batch_size'],
+            kind=kind,
+        ).execute()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully purged {purged_snapshots_count} snapshots',
+            ),
+        )
@@ -0,0 +1,90 @@
+import argparse
+import datetime
+from uuid import UUID
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from snapshots.services import InventoryStocks
+from snapshots.use_cases.inventory_stocks_history import (
+    GetUnitInventoryStocksAtUseCase,
+    GetUnitInventoryStocksHistoryUseCase,
+)
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Invalid ISO datetime: {value}')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = 'Show inventory stocks of a unit from snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument('unit_id', type=UUID)
+        moment_group = parser.add_mutually_exclusive_group()
+        moment_group.add_argument(
+            '--at',
+            type=parse_datetime,
+            help='Show stocks as of this moment. Defaults to now',
+        )
+        moment_group.add_argument(
+            '--from',
+            dest='taken_from',
+            type=parse_datetime,
+            help='Show stocks of every snapshot taken since this moment',
+        )
+        parser.add_argument(
+            '--to',
+            dest='taken_to',
+            type=parse_datetime,
+            help='End of the history period. Defaults to now',
+        )
+
+    def write_inventory_stocks(
+        self,
+        unit_id: UUID,
+        inventory_stocks: InventoryStocks,
+    ) -> None:
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f'Stocks at {inventory_stocks.taken_at.isoformat()}',
+            ),
+        )
+        items = inventory_stocks.unit_id_to_items.get(unit_id, [])
+        for item in sorted(items, key=lambda item: item.name):
+            self.stdout.write(
+                f'{item.name}: {item.quantity} {item.measurement_unit}'
+                f' (calculated at {item.calculated_at.isoformat()})',
+            )
+
+    def handle(self, *args, **options):
+        unit_id: UUID = options['unit_id']
+        now = timezone.now()
+
+        if options['taken_from'] is None:
+            inventory_stocks = GetUnitInventoryStocksAtUseCase(
+                unit_id=unit_id,
+                moment=options['at'] or now,
+            ).execute()
+            if inventory_stocks is None:
+                self.stdout.write(self.style.ERROR('No snapshots found'))
+                return
+            self.write_inventory_stocks(unit_id, inventory_stocks)
+            return
+
+        history = GetUnitInventoryStocksHistoryUseCase(
+            unit_id=unit_id,
+            taken_from=options['taken_from'],
+            taken_to=options['taken_to'] or now,
+        ).execute()
+        for inventory_stocks in history:
+            self.write_inventory_stocks(unit_id, inventory_stocks)
+        self.stdout.write(
+            self.style.SUCCESS(f'Found {len(history)} snapshots'),
+        )
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def delete_inventory_stocks_snapshots(apps, schema_editor):
+    # Snapshots without items would be read as units without stocks.
+    InventoryStocksSnapshot = apps.get_model(
+        'snapshots',
+        'InventoryStocksSnapshot',
+    )
+    InventoryStocksSnapshot.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('snapshots', '0002_inventorystockssnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryStockItemDefinition',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('category_name', models.CharField(max_length=32)),
+                ('measurement_unit', models.CharField(max_length=16)),
+            ],
+        ),
+        migrations.RunPython(
+            delete_inventory_stocks_snapshots,
+            migrations.RunPython.noop,
+        ),
+        migrations.RemoveField(
+            model_name='inventorystockssnapshot',
+            name='data',
+        ),
+        migrations.AddField(
+            model_name='inventorystockssnapshot',
+            name='unit_ids',
+            field=models.JSONField(default=list),
+        ),
+        migrations.CreateModel(
+            name='InventoryStockSnapshotItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_id', models.UUIDField()),
+                ('quantity', models.FloatField()),
+                ('balance_in_money', models.FloatField()),
+                ('currency', models.CharField(max_length=8)),
+                ('avg_weekday_expense', models.FloatField()),
+                ('avg_weekend_expense', models.FloatField()),
+                ('days_until_balance_runs_out', models.IntegerField()),
+                ('calculated_at', models.DateTimeField()),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='snapshots.inventorystockssnapshot')),
+                ('stock_item', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, to='snapshots.inventorystockitemdefinition')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['unit_id', 'snapshot'], name='inventory_stock_unit_idx')],
+            },
+        ),
+    ]
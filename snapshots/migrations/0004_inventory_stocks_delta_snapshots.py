@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('snapshots', '0003_inventory_stocks_columnar_items'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventorystockssnapshot',
+            name='is_keyframe',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.CreateModel(
+            name='InventoryStockSnapshotRemovedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_id', models.UUIDField()),
+                ('stock_item_id', models.UUIDField()),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='removed_items', to='snapshots.inventorystockssnapshot')),
+            ],
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:24
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def set_inventory_stocks_kind(apps, schema_editor):
+    DodoIsApiResponseSnapshot = apps.get_model(
+        'snapshots',
+        'DodoIsApiResponseSnapshot',
+    )
+    max_id = (
+        DodoIsApiResponseSnapshot.objects
+        .aggregate(max_id=Max('id'))['max_id']
+    )
+    if max_id is None:
+        return
+    # Update by id ranges so the table isn't locked by one long update.
+    batch_size = 10_000
+    for first_id in range(1, max_id + 1, batch_size):
+        DodoIsApiResponseSnapshot.objects.filter(
+            id__gte=first_id,
+            id__lt=first_id + batch_size,
+            name__startswith='inventory_stocks_unit_',
+        ).update(kind='inventory_stocks')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('snapshots', '0004_inventory_stocks_delta_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dodoisapiresponsesnapshot',
+            name='kind',
+            field=models.CharField(choices=[('inventory_stocks', 'Inventory Stocks'), ('other', 'Other')], default='other', max_length=32),
+        ),
+        migrations.RunPython(
+            set_inventory_stocks_kind,
+            migrations.RunPython.noop,
+        ),
+        # Indexes are built without blocking writes to the large table.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        'CREATE INDEX CONCURRENTLY IF NOT EXISTS'
+                        ' "snapshots_dodoisapiresponsesnapshot_created_at_b6774b67"'
+                        ' ON "snapshots_dodoisapiresponsesnapshot"'
+                        ' ("created_at")'
+                    ),
+                    reverse_sql=(
+                        'DROP INDEX CONCURRENTLY IF EXISTS'
+                        ' "snapshots_dodoisapiresponsesnapshot_created_at_b6774b67"'
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='dodoisapiresponsesnapshot',
+                    name='created_at',
+                    field=models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                    ),
+                ),
+            ],
+        ),
+        AddIndexConcurrently(
+            model_name='dodoisapiresponsesnapshot',
+            index=models.Index(fields=['kind', 'created_at'], name='dodo_is_api_snapshot_kind_idx'),
+        ),
+    ]
@@ -2,9 +2,93 @@ from django.db import models
 
 
 class DodoIsApiResponseSnapshot(models.Model):
+    class Kind(models.TextChoices):
+        INVENTORY_STOCKS = 'inventory_stocks'
+        OTHER = 'other'
+
     name = models.CharField(max_length=255)
+    kind = models.CharField(
+        max_length=32,
+        choices=Kind.choices,
+        default=Kind.OTHER,
+    )
     data = models.JSONField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return self.name
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('kind', 'created_at'),
+                name='dodo_is_api_snapshot_kind_idx',
+            ),
+        )
+
+
+class InventoryStocksSnapshot(models.Model):
+    """
+    Keyframes store all stock items of the fetched units. Other snapshots
+    store only items changed or removed since the previous snapshot.
+    """
+    # Units whose stocks were fetched, including units without stocks.
+    unit_ids = models.JSONField(default=list)
+    is_keyframe = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'Inventory stocks at {self.created_at.isoformat()}'
+
+
+class InventoryStockItemDefinition(models.Model):
+    """
+    Dictionary of stock items. Snapshots refer to it by id instead of
+    repeating names and categories in every row.
+    """
+    id = models.UUIDField(primary_key=True)
+    name = models.CharField(max_length=255)
+    category_name = models.CharField(max_length=32)
+    measurement_unit = models.CharField(max_length=16)
+
+    def __str__(self):
+        return self.name
+
+
+class InventoryStockSnapshotItem(models.Model):
+    snapshot = models.ForeignKey(
+        InventoryStocksSnapshot,
+        on_delete=models.CASCADE,
+        related_name='items',
+    )
+    unit_id = models.UUIDField()
+    stock_item = models.ForeignKey(
+        InventoryStockItemDefinition,
+        on_delete=models.PROTECT,
+        db_index=False,
+    )
+    quantity = models.FloatField()
+    balance_in_money = models.FloatField()
+    currency = models.CharField(max_length=8)
+    avg_weekday_expense = models.FloatField()
+    avg_weekend_expense = models.FloatField()
+    days_until_balance_runs_out = models.IntegerField()
+    calculated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('unit_id', 'snapshot'),
+                name='inventory_stock_unit_idx',
+            ),
+        )
+
+
+class InventoryStockSnapshotRemovedItem(models.Model):
+    snapshot = models.ForeignKey(
+        InventoryStocksSnapshot,
+        on_delete=models.CASCADE,
+        related_name='removed_items',
+    )
+    unit_id = models.UUIDField()
+    stock_item_id = models.UUIDField()
@@ -0,0 +1,674 @@
+import datetime
+import functools
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Final, TypeAlias
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from redis.exceptions import LockNotOwnedError
+from redis.lock import Lock
+
+from accounts.models import AccountTokens
+from core.services import get_redis
+from reports.services.account_gateways import get_account_dodo_is_api_gateway
+from reports.services.gateways.dodo_is_api import InventoryStockItem
+from snapshots.models import (
+    DodoIsApiResponseSnapshot,
+    InventoryStockItemDefinition,
+    InventoryStockSnapshotItem,
+    InventoryStockSnapshotRemovedItem,
+    InventoryStocksSnapshot,
+)
+from units.models import Unit
+
+__all__ = (
+    'InventoryStocks',
+    'UnitIdToInventoryStocks',
+    'delete_expired_inventory_stocks_snapshots',
+    'fetch_inventory_stocks',
+    'get_inventory_stocks',
+    'get_inventory_stocks_at',
+    'get_unit_inventory_stocks_history',
+    'purge_dodo_is_api_response_snapshots',
+    'take_inventory_stocks_snapshot',
+)
+
+logger = logging.getLogger(__name__)
+
+UnitIdToInventoryStocks: TypeAlias = dict[UUID, list[InventoryStockItem]]
+# (unit id, stock item id) to the stock item.
+InventoryStocksState: TypeAlias = dict[tuple[UUID, UUID], InventoryStockItem]
+
+INVENTORY_STOCKS_SNAPSHOT_LOCK_REDIS_KEY: Final[str] = (
+    'inventory-stocks-snapshot:lock'
+)
+# Longer than fetching stocks of one account takes: the lock is extended
+# after every account.
+INVENTORY_STOCKS_SNAPSHOT_LOCK_TIMEOUT_IN_SECONDS: Final[int] = 15 * 60
+INVENTORY_STOCKS_SNAPSHOT_RETENTION: Final[datetime.timedelta] = (
+    datetime.timedelta(days=30)
+)
+# Bounds how many snapshots are replayed to read a point in time.
+INVENTORY_STOCKS_KEYFRAME_INTERVAL: Final[datetime.timedelta] = (
+    datetime.timedelta(days=1)
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class InventoryStocks:
+    """
+    Stocks as of a snapshot.
+
+    Stocks read back from snapshots are rebuilt from deltas, which don't
+    record items changed only by their calculation time. So `calculated_at`
+    of such items is the time of the snapshot where they last changed,
+    not of the latest fetch: `taken_at` is when they were last fetched.
+    """
+    taken_at: datetime.datetime
+    unit_id_to_items: UnitIdToInventoryStocks
+
+
+def to_inventory_stock_item(
+    snapshot_item: InventoryStockSnapshotItem,
+) -> InventoryStockItem:
+    stock_item = snapshot_item.stock_item
+    return InventoryStockItem.model_validate(
+        {
+            'id': stock_item.id,
+            'name': stock_item.name,
+            'unit_id': snapshot_item.unit_id,
+            'category_name': stock_item.category_name,
+            'quantity': snapshot_item.quantity,
+            'measurement_unit': stock_item.measurement_unit,
+            'balance_in_money': snapshot_item.balance_in_money,
+            'currency': snapshot_item.currency,
+            'avg_weekday_expense': snapshot_item.avg_weekday_expense,
+            'avg_weekend_expense': snapshot_item.avg_weekend_expense,
+            'days_until_balance_runs_out': (
+                snapshot_item.days_until_balance_runs_out
+            ),
+            'calculated_at': snapshot_item.calculated_at,
+        },
+        by_name=True,
+    )
+
+
+def to_snapshot_item(
+    snapshot: InventoryStocksSnapshot,
+    item: InventoryStockItem,
+) -> InventoryStockSnapshotItem:
+    return InventoryStockSnapshotItem(
+        snapshot=snapshot,
+        unit_id=item.unit_id,
+        stock_item_id=item.id,
+        quantity=item.quantity,
+        balance_in_money=item.balance_in_money,
+        currency=item.currency,
+        avg_weekday_expense=item.avg_weekday_expense,
+        avg_weekend_expense=item.avg_weekend_expense,
+        days_until_balance_runs_out=item.days_until_balance_runs_out,
+        calculated_at=item.calculated_at,
+    )
+
+
+def is_stock_item_changed(
+    old_item: InventoryStockItem,
+    new_item: InventoryStockItem,
+) -> bool:
+    # Stocks are recalculated all the time, so the calculation time alone
+    # would make every item look changed.
+    return (
+        old_item.model_dump(exclude={'calculated_at'})
+        != new_item.model_dump(exclude={'calculated_at'})
+    )
+
+
+def get_snapshots_chain(
+    *,
+    first_snapshot_id: int,
+    last_snapshot_id: int,
+) -> list[InventoryStocksSnapshot]:
+    """
+    Returns:
+        Snapshots from the keyframe preceding the first snapshot
+        to the last snapshot, oldest first.
+    """
+    keyframe_id = (
+        InventoryStocksSnapshot.objects
+        .filter(is_keyframe=True, id__lte=first_snapshot_id)
+        .order_by('-id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if keyframe_id is None:
+        keyframe_id = first_snapshot_id
+    return list(
+        InventoryStocksSnapshot.objects
+        .filter(id__gte=keyframe_id, id__lte=last_snapshot_id)
+        .order_by('id'),
+    )
+
+
+def replay_snapshots(
+    snapshots: list[InventoryStocksSnapshot],
+    *,
+    unit_ids: Iterable[UUID] | None = None,
+) -> Iterator[tuple[InventoryStocksSnapshot, InventoryStocksState]]:
+    """
+    Apply snapshots one after another, starting from a keyframe.
+
+    Keyword Args:
+        unit_ids: Replay only these units instead of all units.
+
+    Returns:
+        Every snapshot with stocks as of it. The state is the same object
+        updated in place, so it must be read before taking the next one.
+    """
+    snapshot_items = (
+        InventoryStockSnapshotItem.objects
+        .select_related('stock_item')
+        .filter(snapshot__in=snapshots)
+    )
+    removed_items = InventoryStockSnapshotRemovedItem.objects.filter(
+        snapshot__in=snapshots,
+    )
+    if unit_ids is not None:
+        unit_ids = list(unit_ids)
+        snapshot_items = snapshot_items.filter(unit_id__in=unit_ids)
+        removed_items = removed_items.filter(unit_id__in=unit_ids)
+
+    snapshot_id_to_items: dict[int, list[InventoryStockSnapshotItem]] = (
+        defaultdict(list)
+    )
+    for snapshot_item in snapshot_items:
+        snapshot_id_to_items[snapshot_item.snapshot_id].append(snapshot_item)
+    snapshot_id_to_removed_items: dict[
+        int, list[InventoryStockSnapshotRemovedItem]
+    ] = defaultdict(list)
+    for removed_item in removed_items:
+        snapshot_id_to_removed_items[removed_item.snapshot_id].append(
+            removed_item,
+        )
+
+    state: InventoryStocksState = {}
+    for snapshot in snapshots:
+        if snapshot.is_keyframe:
+            state.clear()
+        for removed_item in snapshot_id_to_removed_items[snapshot.id]:
+            state.pop(
+                (removed_item.unit_id, removed_item.stock_item_id),
+                None,
+            )
+        for snapshot_item in snapshot_id_to_items[snapshot.id]:
+            state[(snapshot_item.unit_id, snapshot_item.stock_item_id)] = (
+                to_inventory_stock_item(snapshot_item)
+            )
+        yield snapshot, state
+
+
+def get_inventory_stocks_state(
+    snapshot: InventoryStocksSnapshot,
+    *,
+    unit_ids: Iterable[UUID] | None = None,
+) -> InventoryStocksState:
+    """Reconstruct stocks as of the snapshot from the preceding keyframe."""
+    state: InventoryStocksState = {}
+    for _, state in replay_snapshots(
+        get_snapshots_chain(
+            first_snapshot_id=snapshot.id,
+            last_snapshot_id=snapshot.id,
+        ),
+        unit_ids=unit_ids,
+    ):
+        pass
+    return state
+
+
+def to_inventory_stocks_from_state(
+    snapshot: InventoryStocksSnapshot,
+    state: InventoryStocksState,
+    *,
+    unit_ids: Iterable[UUID] | None = None,
+) -> InventoryStocks:
+    snapshot_unit_ids = [UUID(unit_id) for unit_id in snapshot.unit_ids]
+    if unit_ids is not None:
+        unit_ids = set(unit_ids)
+        snapshot_unit_ids = [
+            unit_id for unit_id in snapshot_unit_ids if unit_id in unit_ids
+        ]
+
+    unit_id_to_items: UnitIdToInventoryStocks = {
+        unit_id: [] for unit_id in snapshot_unit_ids
+    }
+    for (unit_id, _), item in state.items():
+        if unit_id in unit_id_to_items:
+            unit_id_to_items[unit_id].append(item)
+    return InventoryStocks(
+        taken_at=snapshot.created_at,
+        unit_id_to_items=unit_id_to_items,
+    )
+
+
+def to_inventory_stocks(
+    snapshot: InventoryStocksSnapshot,
+    *,
+    unit_ids: Iterable[UUID] | None = None,
+) -> InventoryStocks:
+    """
+    Keyword Args:
+        unit_ids: Read only these units instead of all units
+            of the snapshot.
+    """
+    if unit_ids is not None:
+        unit_ids = list(unit_ids)
+    return to_inventory_stocks_from_state(
+        snapshot,
+        get_inventory_stocks_state(snapshot, unit_ids=unit_ids),
+        unit_ids=unit_ids,
+    )
+
+
+def save_stock_item_definitions(items: Iterable[InventoryStockItem]) -> None:
+    # A statement can't upsert the same row twice.
+    stock_item_id_to_definition = {
+        item.id: InventoryStockItemDefinition(
+            id=item.id,
+            name=item.name,
+            category_name=item.category_name,
+            measurement_unit=item.measurement_unit,
+        )
+        for item in items
+    }
+    InventoryStockItemDefinition.objects.bulk_create(
+        stock_item_id_to_definition.values(),
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=('id',),
+        update_fields=('name', 'category_name', 'measurement_unit'),
+    )
+
+
+def get_changes(
+    *,
+    previous_state: InventoryStocksState,
+    unit_id_to_items: UnitIdToInventoryStocks,
+) -> tuple[list[InventoryStockItem], list[tuple[UUID, UUID]]]:
+    """
+    Compare fetched stocks with the previous snapshot. Units that were not
+    fetched this time are not compared, their stocks are kept as is.
+
+    Returns:
+        Changed or new items, and (unit id, stock item id) of removed ones.
+    """
+    changed_items: list[InventoryStockItem] = []
+    fetched_keys: set[tuple[UUID, UUID]] = set()
+    for unit_items in unit_id_to_items.values():
+        for item in unit_items:
+            key = (item.unit_id, item.id)
+            fetched_keys.add(key)
+            previous_item = previous_state.get(key)
+            if (
+                previous_item is None
+                or is_stock_item_changed(previous_item, item)
+            ):
+                changed_items.append(item)
+
+    removed_keys = [
+        key for key in previous_state
+        if key[0] in unit_id_to_items and key not in fetched_keys
+    ]
+    return changed_items, removed_keys
+
+
+def lock_inventory_stocks_snapshots() -> None:
+    """
+    Block saving of other snapshots until the end of the transaction.
+    Reading snapshots is not blocked.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'LOCK TABLE {InventoryStocksSnapshot._meta.db_table}'
+            f' IN EXCLUSIVE MODE',
+        )
+
+
+def save_inventory_stocks_snapshot(
+    unit_id_to_items: UnitIdToInventoryStocks,
+) -> InventoryStocksSnapshot:
+    """
+    Save a keyframe if the last one is older than
+    `INVENTORY_STOCKS_KEYFRAME_INTERVAL`, otherwise save only changes
+    since the latest snapshot.
+
+    The latest snapshot is read after locking the snapshots table, so
+    a delta is never computed against a base that another save is
+    about to replace.
+    """
+    with transaction.atomic():
+        lock_inventory_stocks_snapshots()
+        last_keyframe = (
+            InventoryStocksSnapshot.objects
+            .filter(is_keyframe=True)
+            .order_by('-id')
+            .first()
+        )
+        is_keyframe = (
+            last_keyframe is None
+            or last_keyframe.created_at
+            <= timezone.now() - INVENTORY_STOCKS_KEYFRAME_INTERVAL
+        )
+
+        removed_keys: list[tuple[UUID, UUID]] = []
+        if is_keyframe:
+            items = [
+                item
+                for unit_items in unit_id_to_items.values()
+                for item in unit_items
+            ]
+        else:
+            latest_snapshot = (
+                InventoryStocksSnapshot.objects.order_by('-id').first()
+            )
+            items, removed_keys = get_changes(
+                previous_state=get_inventory_stocks_state(latest_snapshot),
+                unit_id_to_items=unit_id_to_items,
+            )
+
+        save_stock_item_definitions(items)
+        snapshot = InventoryStocksSnapshot.objects.create(
+            unit_ids=[str(unit_id) for unit_id in unit_id_to_items],
+            is_keyframe=is_keyframe,
+        )
+        InventoryStockSnapshotItem.objects.bulk_create(
+            [to_snapshot_item(snapshot, item) for item in items],
+            batch_size=1000,
+        )
+        InventoryStockSnapshotRemovedItem.objects.bulk_create(
+            [
+                InventoryStockSnapshotRemovedItem(
+                    snapshot=snapshot,
+                    unit_id=unit_id,
+                    stock_item_id=stock_item_id,
+                )
+                for unit_id, stock_item_id in removed_keys
+            ],
+            batch_size=1000,
+        )
+
+    logger.info(
+        'Saved inventory stocks %s with %d items and %d removed items',
+        'keyframe' if is_keyframe else 'delta',
+        len(items),
+        len(removed_keys),
+    )
+    return snapshot
+
+
+def delete_expired_inventory_stocks_snapshots(
+    expired_at: datetime.datetime,
+) -> int:
+    """
+    Delete snapshots taken before `expired_at`, except ones still needed
+    to read later snapshots: history is cut at the last keyframe taken
+    before `expired_at`.
+
+    Snapshots are deleted one by one, so a single delete never takes
+    more rows than one snapshot has.
+
+    Returns:
+        Count of deleted snapshots.
+    """
+    last_expired_keyframe_id = (
+        InventoryStocksSnapshot.objects
+        .filter(is_keyframe=True, created_at__lt=expired_at)
+        .order_by('-id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if last_expired_keyframe_id is None:
+        return 0
+
+    expired_snapshot_ids = list(
+        InventoryStocksSnapshot.objects
+        .filter(id__lt=last_expired_keyframe_id)
+        .order_by('id')
+        .values_list('id', flat=True),
+    )
+    for snapshot_id in expired_snapshot_ids:
+        InventoryStocksSnapshot.objects.filter(id=snapshot_id).delete()
+    return len(expired_snapshot_ids)
+
+
+def purge_dodo_is_api_response_snapshots(
+    *,
+    created_before: datetime.datetime,
+    kind: DodoIsApiResponseSnapshot.Kind | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Delete old Dodo IS API response snapshots batch by batch.
+
+    Every batch is a short delete by primary keys found through
+    the `created_at` index, so the table is never locked for long
+    and the purge takes the same time however long the history is.
+
+    Keyword Args:
+        kind: Purge only snapshots of this kind instead of all kinds.
+
+    Returns:
+        Count of deleted snapshots.
+    """
+    snapshots = DodoIsApiResponseSnapshot.objects.filter(
+        created_at__lt=created_before,
+    )
+    if kind is not None:
+        snapshots = snapshots.filter(kind=kind)
+
+    deleted_snapshots_count = 0
+    while True:
+        snapshot_ids = list(
+            snapshots
+            .order_by('created_at')
+            .values_list('id', flat=True)[:batch_size],
+        )
+        if not snapshot_ids:
+            break
+        DodoIsApiResponseSnapshot.objects.filter(id__in=snapshot_ids).delete()
+        deleted_snapshots_count += len(snapshot_ids)
+        logger.debug(
+            'Purged %d Dodo IS API response snapshots',
+            deleted_snapshots_count,
+        )
+    return deleted_snapshots_count
+
+
+def fetch_inventory_stocks(
+    *,
+    on_account_fetched: Callable[[], None] | None = None,
+) -> UnitIdToInventoryStocks:
+    """
+    Keyword Args:
+        on_account_fetched: Called after stocks of every account
+            are fetched.
+
+    Returns:
+        Stocks of units of all accounts. Units whose stocks could not be
+        fetched are left out.
+    """
+    accounts_tokens = AccountTokens.objects.select_related('account').all()
+
+    unit_id_to_items: UnitIdToInventoryStocks = {}
+    for account_tokens in accounts_tokens:
+        units = Unit.objects.filter(
+            dodo_is_api_account_name=account_tokens.account.name,
+        )
+        unit_ids = {unit.uuid for unit in units}
+
+        with get_account_dodo_is_api_gateway(
+            account_tokens,
+        ) as dodo_is_api_gateway:
+            unit_id_to_items |= (
+                dodo_is_api_gateway.get_inventory_stocks_by_units(
+                    unit_ids=unit_ids,
+                )
+            )
+        if on_account_fetched is not None:
+            on_account_fetched()
+    return unit_id_to_items
+
+
+def take_inventory_stocks_snapshot(
+    *,
+    on_account_fetched: Callable[[], None] | None = None,
+) -> InventoryStocks:
+    unit_id_to_items = fetch_inventory_stocks(
+        on_account_fetched=on_account_fetched,
+    )
+    snapshot = save_inventory_stocks_snapshot(unit_id_to_items)
+    delete_expired_inventory_stocks_snapshots(
+        snapshot.created_at - INVENTORY_STOCKS_SNAPSHOT_RETENTION,
+    )
+    return InventoryStocks(
+        taken_at=snapshot.created_at,
+        unit_id_to_items=unit_id_to_items,
+    )
+
+
+def get_latest_inventory_stocks_snapshot(
+    *,
+    max_age: datetime.timedelta,
+) -> InventoryStocksSnapshot | None:
+    return (
+        InventoryStocksSnapshot.objects
+        .filter(created_at__gte=timezone.now() - max_age)
+        .order_by('-created_at')
+        .first()
+    )
+
+
+def extend_lock(lock: Lock) -> None:
+    """Reset the timeout of the lock unless it has already expired."""
+    try:
+        lock.reacquire()
+    except LockNotOwnedError:
+        logger.warning('Inventory stocks snapshot lock has expired')
+
+
+def release_lock(lock: Lock) -> None:
+    try:
+        lock.release()
+    except LockNotOwnedError:
+        logger.warning(
+            'Inventory stocks snapshot lock expired before being released',
+        )
+
+
+def get_inventory_stocks(
+    *,
+    max_age: datetime.timedelta | None = None,
+) -> InventoryStocks:
+    """
+    Get stocks of all units from the latest snapshot, taking a new
+    snapshot if the latest one is older than `max_age`.
+
+    Only taking a snapshot is locked: jobs running at the same time wait
+    for the one taking the snapshot instead of fetching the same stocks
+    from Dodo IS again, while a fresh snapshot is read without waiting.
+
+    Keyword Args:
+        max_age: Defaults to the
+            `INVENTORY_STOCKS_SNAPSHOT_MAX_AGE_IN_SECONDS` setting.
+    """
+    if max_age is None:
+        max_age = datetime.timedelta(
+            seconds=settings.INVENTORY_STOCKS_SNAPSHOT_MAX_AGE_IN_SECONDS,
+        )
+
+    snapshot = get_latest_inventory_stocks_snapshot(max_age=max_age)
+    if snapshot is None:
+        lock = get_redis().lock(
+            INVENTORY_STOCKS_SNAPSHOT_LOCK_REDIS_KEY,
+            timeout=INVENTORY_STOCKS_SNAPSHOT_LOCK_TIMEOUT_IN_SECONDS,
+        )
+        lock.acquire()
+        try:
+            snapshot = get_latest_inventory_stocks_snapshot(max_age=max_age)
+            if snapshot is None:
+                return take_inventory_stocks_snapshot(
+                    on_account_fetched=functools.partial(extend_lock, lock),
+                )
+        finally:
+            release_lock(lock)
+
+    logger.info(
+        'Reusing inventory stocks snapshot taken at %s',
+        snapshot.created_at,
+    )
+    return to_inventory_stocks(snapshot)
+
+
+def get_inventory_stocks_at(
+    moment: datetime.datetime,
+    *,
+    unit_ids: Iterable[UUID] | None = None,
+) -> InventoryStocks | None:
+    """
+    Returns:
+        Stocks of the latest snapshot taken at or before the moment,
+        or None if there is no such snapshot.
+    """
+    snapshot = (
+        InventoryStocksSnapshot.objects
+        .filter(created_at__lte=moment)
+        .order_by('-id')
+        .first()
+    )
+    if snapshot is None:
+        return None
+    return to_inventory_stocks(snapshot, unit_ids=unit_ids)
+
+
+def get_unit_inventory_stocks_history(
+    *,
+    unit_id: UUID,
+    taken_from: datetime.datetime,
+    taken_to: datetime.datetime,
+) -> list[InventoryStocks]:
+    """
+    Returns:
+        Stocks of the unit in every snapshot taken within the period
+        that includes the unit, oldest first.
+    """
+    snapshot_ids = list(
+        InventoryStocksSnapshot.objects
+        .filter(created_at__range=(taken_from, taken_to))
+        .values_list('id', flat=True),
+    )
+    if not snapshot_ids:
+        return []
+
+    history: list[InventoryStocks] = []
+    for snapshot, state in replay_snapshots(
+        get_snapshots_chain(
+            first_snapshot_id=min(snapshot_ids),
+            last_snapshot_id=max(snapshot_ids),
+        ),
+        unit_ids=[unit_id],
+    ):
+        if snapshot.created_at < taken_from:
+            continue
+        if str(unit_id) not in snapshot.unit_ids:
+            continue
+        history.append(
+            to_inventory_stocks_from_state(
+                snapshot,
+                state,
+                unit_ids=[unit_id],
+            ),
+        )
+    return history
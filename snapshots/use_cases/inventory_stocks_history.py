@@ -0,0 +1,32 @@
+import datetime
+from dataclasses import dataclass
+from uuid import UUID
+
+from snapshots.services import (
+    InventoryStocks,
+    get_inventory_stocks_at,
+    get_unit_inventory_stocks_history,
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class GetUnitInventoryStocksAtUseCase:
+    unit_id: UUID
+    moment: datetime.datetime
+
+    def execute(self) -> InventoryStocks | None:
+        return get_inventory_stocks_at(self.moment, unit_ids=[self.unit_id])
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class GetUnitInventoryStocksHistoryUseCase:
+    unit_id: UUID
+    taken_from: datetime.datetime
+    taken_to: datetime.datetime
+
+    def execute(self) -> list[InventoryStocks]:
+        return get_unit_inventory_stocks_history(
+            unit_id=self.unit_id,
+            taken_from=self.taken_from,
+            taken_to=self.taken_to,
+        )
@@ -0,0 +1,35 @@
+import datetime
+from dataclasses import dataclass
+
+from django.utils import timezone
+
+from snapshots.models import DodoIsApiResponseSnapshot
+from snapshots.services import (
+    delete_expired_inventory_stocks_snapshots,
+    purge_dodo_is_api_response_snapshots,
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PurgeSnapshotsUseCase:
+    retention_in_days: int
+    batch_size: int = 1000
+    kind: DodoIsApiResponseSnapshot.Kind | None = None
+
+    def execute(self) -> int:
+        created_before = (
+            timezone.now() - datetime.timedelta(days=self.retention_in_days)
+        )
+        purged_snapshots_count = purge_dodo_is_api_response_snapshots(
+            created_before=created_before,
+            kind=self.kind,
+            batch_size=self.batch_size,
+        )
+        if self.kind in (
+            None,
+            DodoIsApiResponseSnapshot.Kind.INVENTORY_STOCKS,
+        ):
+            purged_snapshots_count += (
+                delete_expired_inventory_stocks_snapshots(created_before)
+            )
+        return purged_snapshots_count
@@ -0,0 +1,89 @@
+import functools
+import threading
+from dataclasses import dataclass
+from typing import Final
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from telebot import TeleBot, apihelper
+
+
+# Matches the count of dispatcher threads sending at the same time.
+CONNECTION_POOL_MAX_SIZE: Final[int] = 30
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TelegramConnectionPoolStats:
+    requests_count: int
+    connections_count: int
+
+    @property
+    def reused_connections_count(self) -> int:
+        return self.requests_count - self.connections_count
+
+
+class TelegramHttpSession:
+    """
+    HTTP session with keep-alive connections to the Telegram Bot API
+    shared by all threads.
+    """
+
+    def __init__(self, *, pool_max_size: int = CONNECTION_POOL_MAX_SIZE):
+        self.__adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_max_size,
+            pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self.__adapter)
+
+    def get_stats(self) -> TelegramConnectionPoolStats:
+        pools = self.__adapter.poolmanager.pools
+        connection_pools = [
+            pool for key in pools.keys()
+            if (pool := pools.get(key)) is not None
+        ]
+        return TelegramConnectionPoolStats(
+            requests_count=sum(pool.num_requests for pool in connection_pools),
+            connections_count=sum(
+                pool.num_connections for pool in connection_pools
+            ),
+        )
+
+
+_lock = threading.Lock()
+
+
+@functools.cache
+def get_telegram_http_session() -> TelegramHttpSession:
+    http_session = TelegramHttpSession()
+    # pyTelegramBotAPI sends all requests through this session
+    # instead of creating one per thread.
+    apihelper.session = http_session.session
+    return http_session
+
+
+@functools.cache
+def create_telegram_bot() -> TeleBot:
+    get_telegram_http_session()
+    return TeleBot(
+        token=settings.TELEGRAM_BOT_TOKEN,
+        parse_mode='HTML',
+        threaded=False,
+    )
+
+
+def get_telegram_bot() -> TeleBot:
+    """
+    Returns:
+        Bot shared by the whole process. It is used only to call
+        the Bot API, so it does not start threads for handling updates.
+    """
+    # Dispatcher threads may ask for the bot at the same time.
+    with _lock:
+        return create_telegram_bot()
+
+
+def get_telegram_connection_pool_stats() -> TelegramConnectionPoolStats:
+    return get_telegram_http_session().get_stats()
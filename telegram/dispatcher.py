@@ -0,0 +1,221 @@
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Final
+
+from telebot.apihelper import ApiTelegramException
+
+from telegram.models import TelegramMessage
+from telegram.rate_limiting import (
+    TelegramRateLimiter,
+    get_telegram_rate_limiter,
+)
+from telegram.retries import get_retry_after
+from telegram.services import (
+    TelegramMessageSender,
+    coalesce_messages,
+    join_messages,
+    release_messages,
+    save_sending_outcomes,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Longer flood waits are not slept through in a worker thread:
+# the message is rescheduled instead.
+MAX_FLOOD_WAIT_IN_SECONDS: Final[int] = 30
+MAX_FLOOD_WAIT_ATTEMPTS: Final[int] = 3
+# Outcomes are written back once this many messages are processed,
+# so a crash loses only a few outcomes, not the whole batch.
+SAVE_OUTCOMES_BATCH_SIZE: Final[int] = 100
+
+
+def group_messages_by_chat_id(
+    messages: Iterable[TelegramMessage],
+) -> dict[int, list[TelegramMessage]]:
+    chat_id_to_messages: dict[int, list[TelegramMessage]] = defaultdict(list)
+    for message in messages:
+        chat_id_to_messages[message.chat_id].append(message)
+    return chat_id_to_messages
+
+
+class TelegramMessageDispatcher:
+    """
+    Sends messages to different chats concurrently.
+
+    Messages of the same chat are sent one by one in the given order.
+    Sending is throttled by the rate limiter, and "429 Too Many Requests"
+    responses pause the chat for `retry_after` seconds. Worker threads
+    only talk to Telegram, outcomes are written back by the calling thread
+    with bulk updates. Processed messages are saved unclaimed, the rest
+    are released. Network and other unexpected errors are retried with
+    backoff like failed API requests, and later messages of the chat
+    wait for the failed one.
+
+    With coalescing enabled, consecutive text messages of a chat are
+    joined and sent as one message, each of them is marked with the id
+    of that message.
+
+    The thread pool is kept between `dispatch` calls, so HTTP sessions of
+    the worker threads stay warm. Call `shutdown` or use the dispatcher
+    as a context manager to stop the threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_limiter: TelegramRateLimiter | None = None,
+        max_workers: int = 30,
+        is_coalescing_enabled: bool = False,
+    ):
+        if rate_limiter is None:
+            rate_limiter = get_telegram_rate_limiter()
+        self.__rate_limiter = rate_limiter
+        self.__is_coalescing_enabled = is_coalescing_enabled
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='telegram-dispatcher',
+        )
+
+    def __enter__(self) -> 'TelegramMessageDispatcher':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=True)
+
+    def send_messages_together(self, messages: list[TelegramMessage]) -> None:
+        """Send messages of one chat as a single message."""
+        message = join_messages(messages)
+        sender = TelegramMessageSender(message=message)
+        source_senders = [
+            TelegramMessageSender(message=source_message)
+            for source_message in messages
+        ]
+
+        for attempt in range(1, MAX_FLOOD_WAIT_ATTEMPTS + 1):
+            self.__rate_limiter.acquire(message.chat_id)
+            try:
+                sent_messages = sender.send_messages()
+            except ApiTelegramException as error:
+                retry_after = get_retry_after(error)
+                if retry_after is None:
+                    for source_sender in source_senders:
+                        source_sender.mark_as_failed(error)
+                    return
+                logger.warning(
+                    'Flood limit exceeded for chat %d, retry after %d s',
+                    message.chat_id,
+                    retry_after,
+                )
+                self.__rate_limiter.pause_chat(
+                    chat_id=message.chat_id,
+                    seconds=retry_after,
+                )
+                # Flood waits don't spend retries of the message.
+                if (
+                    retry_after > MAX_FLOOD_WAIT_IN_SECONDS
+                    or attempt == MAX_FLOOD_WAIT_ATTEMPTS
+                ):
+                    for source_sender in source_senders:
+                        source_sender.postpone(retry_after)
+                    return
+            else:
+                for source_sender in source_senders:
+                    source_sender.mark_as_sent(sent_messages)
+                return
+
+    def send_chat_messages(
+        self,
+        messages: list[TelegramMessage],
+        *,
+        stop_event: threading.Event | None = None,
+    ) -> list[TelegramMessage]:
+        """
+        Returns:
+            Messages that have been attempted to be sent and must be saved.
+        """
+        if self.__is_coalescing_enabled:
+            message_groups = coalesce_messages(messages)
+        else:
+            message_groups = [[message] for message in messages]
+
+        processed_messages: list[TelegramMessage] = []
+        for index, message_group in enumerate(message_groups):
+            if stop_event is not None and stop_event.is_set():
+                break
+            try:
+                self.send_messages_together(message_group)
+            except Exception as error:
+                logger.exception(
+                    'Could not send messages %s to chat %d',
+                    [message.id for message in message_group],
+                    message_group[0].chat_id,
+                )
+                for message in message_group:
+                    TelegramMessageSender(message=message).mark_as_failed(
+                        error,
+                    )
+                processed_messages += message_group
+                # Later messages of the chat keep their order and wait
+                # for the failed ones without spending retries.
+                to_be_sent_at = message_group[0].to_be_sent_at
+                for later_message_group in message_groups[index + 1:]:
+                    for message in later_message_group:
+                        message.to_be_sent_at = max(
+                            message.to_be_sent_at,
+                            to_be_sent_at,
+                        )
+                    processed_messages += later_message_group
+                break
+            processed_messages += message_group
+        return processed_messages
+
+    def dispatch(
+        self,
+        messages: Iterable[TelegramMessage],
+        *,
+        stop_event: threading.Event | None = None,
+    ) -> int:
+        """
+        Keyword Args:
+            stop_event: once set, messages not sent yet are left pending.
+
+        Returns:
+            Count of processed messages.
+        """
+        messages = list(messages)
+        chat_id_to_messages = group_messages_by_chat_id(messages)
+
+        futures = [
+            self.__executor.submit(
+                self.send_chat_messages,
+                chat_messages,
+                stop_event=stop_event,
+            )
+            for chat_messages in chat_id_to_messages.values()
+        ]
+        processed_message_ids: set[int] = set()
+        not_saved_messages: list[TelegramMessage] = []
+        for future in as_completed(futures):
+            for message in future.result():
+                not_saved_messages.append(message)
+                processed_message_ids.add(message.id)
+            if len(not_saved_messages) >= SAVE_OUTCOMES_BATCH_SIZE:
+                save_sending_outcomes(not_saved_messages)
+                not_saved_messages = []
+        if not_saved_messages:
+            save_sending_outcomes(not_saved_messages)
+
+        not_processed_messages = [
+            message for message in messages
+            if message.id not in processed_message_ids
+        ]
+        if not_processed_messages:
+            release_messages(not_processed_messages)
+        return len(processed_message_ids)
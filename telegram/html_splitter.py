@@ -0,0 +1,118 @@
+import re
+from collections.abc import Iterator
+
+
+TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][\w-]*)[^>]*>')
+
+# (tag name, opening tag with attributes)
+OpenTags = list[tuple[str, str]]
+
+
+def get_open_tags(text: str, open_tags: OpenTags) -> OpenTags:
+    """
+    Returns:
+        Tags still open after the text, given tags open before it.
+    """
+    open_tags = list(open_tags)
+    for match in TAG_PATTERN.finditer(text):
+        is_closing_tag, tag_name = bool(match.group(1)), match.group(2)
+        if not is_closing_tag:
+            open_tags.append((tag_name, match.group(0)))
+            continue
+        for i in range(len(open_tags) - 1, -1, -1):
+            if open_tags[i][0] == tag_name:
+                del open_tags[i]
+                break
+    return open_tags
+
+
+def render_opening_tags(open_tags: OpenTags) -> str:
+    return ''.join(opening_tag for _, opening_tag in open_tags)
+
+
+def render_closing_tags(open_tags: OpenTags) -> str:
+    return ''.join(f'</{tag_name}>' for tag_name, _ in reversed(open_tags))
+
+
+def split_long_line(line: str, max_length: int) -> Iterator[tuple[str, str]]:
+    """
+    Cut a line by spaces, never inside a tag or an HTML entity.
+
+    Returns:
+        Pieces of the line, each with the text cut out before it: spaces,
+        or nothing if the line was cut inside a word.
+    """
+    separator = ''
+    while len(line) > max_length:
+        cut_index = line.rfind(' ', 0, max_length)
+        if cut_index <= 0:
+            cut_index = max_length
+        tag_start_index = line.rfind('<', 0, cut_index)
+        if tag_start_index > line.rfind('>', 0, cut_index):
+            cut_index = tag_start_index
+        entity_start_index = line.rfind('&', 0, cut_index)
+        if entity_start_index > line.rfind(';', 0, cut_index):
+            cut_index = entity_start_index
+        if cut_index <= 0:
+            cut_index = max_length
+
+        yield separator, line[:cut_index]
+        rest = line[cut_index:]
+        line = rest.lstrip(' ')
+        separator = rest[:len(rest) - len(line)]
+    yield separator, line
+
+
+def iter_lines(text: str, max_line_length: int) -> Iterator[tuple[str, str]]:
+    """
+    Returns:
+        Pieces of lines, each with the text separating it from the
+        previous piece, so that joining them gives the text back.
+    """
+    line_separator = ''
+    for line in text.split('\n'):
+        pieces = split_long_line(line, max_line_length)
+        _, first_piece = next(pieces)
+        yield line_separator, first_piece
+        yield from pieces
+        line_separator = '\n'
+
+
+def split_html_text(text: str, max_length: int) -> list[str]:
+    """
+    Split HTML text into parts of at most `max_length` characters.
+
+    Text is split on line boundaries, only lines too long for a single
+    part are cut by spaces. Pieces of a cut line that end up in the same
+    part are joined back as they were. Tags open at the end of a part are
+    closed in it and opened again at the start of the next part, so every
+    part is valid HTML by itself.
+    """
+    if len(text) <= max_length:
+        return [text]
+
+    parts: list[str] = []
+    part = ''
+    has_lines = False
+    open_tags: OpenTags = []
+
+    # Leave room for the tags closed and reopened around the line.
+    for separator, line in iter_lines(
+        text,
+        max_line_length=max_length // 2,
+    ):
+        line_open_tags = get_open_tags(line, open_tags)
+        extended_part = f'{part}{separator}{line}'
+        extended_part_length = (
+            len(extended_part) + len(render_closing_tags(line_open_tags))
+        )
+        if has_lines and extended_part_length > max_length:
+            parts.append(part + render_closing_tags(open_tags))
+            part = render_opening_tags(open_tags) + line
+        else:
+            part = extended_part
+        has_lines = True
+        open_tags = line_open_tags
+
+    parts.append(part + render_closing_tags(open_tags))
+    return parts
@@ -0,0 +1,40 @@
+from django.core.management import BaseCommand
+
+from telegram.use_cases.archive_telegram_messages import (
+    ArchiveTelegramMessagesUseCase,
+)
+
+
+class Command(BaseCommand):
+    help = 'Move sent and exhausted Telegram messages out of the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Keep messages finished within this count of days',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Count of messages moved in one transaction',
+        )
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Delete messages instead of moving them to the archive',
+        )
+
+    def handle(self, *args, **options):
+        archived_messages_count = ArchiveTelegramMessagesUseCase(
+            retention_in_days=options['days'],
+            batch_size=options['batch_size'],
+            is_delete_only=options['delete'],
+        ).execute()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully archived {archived_messages_count} messages',
+            ),
+        )
@@ -1,14 +1,73 @@
 from django.core.management import BaseCommand
 
+from telegram.client import get_telegram_connection_pool_stats
 from telegram.use_cases.send_pending_telegram_messages import (
+    RunTelegramOutboxWorkerUseCase,
     SendPendingTelegramMessagesUseCase,
 )
 
 
 class Command(BaseCommand):
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=300,
+            help='Maximum count of pending messages to send at once',
+        )
+        parser.add_argument(
+            '--worker',
+            action='store_true',
+            help='Keep running and send new messages until SIGTERM',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help=(
+                'Seconds between outbox polls in worker mode.'
+                ' Defaults to 1, or to 30 with --listen'
+            ),
+        )
+        parser.add_argument(
+            '--listen',
+            action='store_true',
+            help='Wake up the worker on new messages with LISTEN/NOTIFY',
+        )
+        parser.add_argument(
+            '--coalesce',
+            action='store_true',
+            help='Join consecutive text messages to the same chat into one',
+        )
+
     def handle(self, *args, **options):
-        SendPendingTelegramMessagesUseCase().execute()
+        if options['worker']:
+            poll_interval_in_seconds = options['poll_interval']
+            if poll_interval_in_seconds is None:
+                poll_interval_in_seconds = 30 if options['listen'] else 1
+            RunTelegramOutboxWorkerUseCase(
+                batch_size=options['limit'],
+                poll_interval_in_seconds=poll_interval_in_seconds,
+                is_coalescing_enabled=options['coalesce'],
+                is_listening=options['listen'],
+            ).execute()
+            self.stdout.write(
+                self.style.SUCCESS('Telegram outbox worker stopped'),
+            )
+            return
+
+        sent_messages_count = SendPendingTelegramMessagesUseCase(
+            limit=options['limit'],
+            is_coalescing_enabled=options['coalesce'],
+        ).execute()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully sent {sent_messages_count} pending messages',
+            ),
+        )
+        connection_pool_stats = get_telegram_connection_pool_stats()
         self.stdout.write(
-            self.style.SUCCESS('Successfully sent pending messages'),
+            f'Telegram API requests: {connection_pool_stats.requests_count},'
+            f' connections opened: {connection_pool_stats.connections_count}',
         )
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram', '0003_telegrammessage_priority'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='telegrammessage',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='The time at which a sender took the message. Messages claimed long ago are taken by other senders again.', null=True, verbose_name='Claimed at'),
+        ),
+    ]
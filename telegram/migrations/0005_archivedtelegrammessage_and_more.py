@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:08
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('telegram', '0004_telegrammessage_claimed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTelegramMessage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('chat_id', models.BigIntegerField(verbose_name='Chat ID')),
+                ('chat_message_ids', models.JSONField(blank=True, null=True, verbose_name='Chat message IDs')),
+                ('text', models.TextField(blank=True, max_length=4096, null=True, verbose_name='Message text')),
+                ('media_file_ids', models.JSONField(blank=True, null=True, verbose_name='Media file IDs')),
+                ('error_message', models.CharField(blank=True, max_length=4096, null=True, verbose_name='Error message')),
+                ('retries_count', models.PositiveIntegerField(verbose_name='Retries left')),
+                ('to_be_sent_at', models.DateTimeField(verbose_name='To be sent at')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Sent at')),
+                ('created_at', models.DateTimeField(verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(verbose_name='Updated at')),
+                ('reply_markup', models.JSONField(blank=True, null=True, verbose_name='Reply markup')),
+                ('priority', models.PositiveSmallIntegerField(verbose_name='Priority')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archived at')),
+            ],
+            options={
+                'verbose_name': 'Archived Telegram message',
+                'verbose_name_plural': 'Archived Telegram messages',
+                'ordering': ('-created_at',),
+            },
+        ),
+        # Built without blocking writes to the outbox.
+        AddIndexConcurrently(
+            model_name='telegrammessage',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True), ('retries_count__gt', 0)), fields=['priority', 'to_be_sent_at', 'created_at', 'id'], name='telegram_message_pending_idx'),
+        ),
+    ]
@@ -115,11 +115,32 @@ class TelegramMessage(models.Model):
         default=100,
         help_text=_('Lower priority number messages are sent first.'),
     )
+    claimed_at = models.DateTimeField(
+        verbose_name=_('Claimed at'),
+        help_text=_(
+            'The time at which a sender took the message. Messages claimed'
+            ' long ago are taken by other senders again.',
+        ),
+        null=True,
+        blank=True,
+    )
 
     class Meta:
         verbose_name = _('Telegram message')
         verbose_name_plural = _('Telegram messages')
         ordering = ('-created_at',)
+        indexes = (
+            # Matches the filter and the order of the pending messages
+            # query of the outbox senders.
+            models.Index(
+                fields=('priority', 'to_be_sent_at', 'created_at', 'id'),
+                condition=(
+                    models.Q(sent_at__isnull=True)
+                    & models.Q(retries_count__gt=0)
+                ),
+                name='telegram_message_pending_idx',
+            ),
+        )
         constraints = (
             models.CheckConstraint(
                 condition=(
@@ -142,3 +163,68 @@ class TelegramMessage(models.Model):
                 ),
             ),
         )
+
+
+class ArchivedTelegramMessage(models.Model):
+    """Sent or exhausted `TelegramMessage` moved out of the outbox."""
+
+    id = models.BigIntegerField(primary_key=True)
+    chat_id = models.BigIntegerField(
+        verbose_name=_('Chat ID'),
+    )
+    chat_message_ids = models.JSONField(
+        verbose_name=_('Chat message IDs'),
+        null=True,
+        blank=True,
+    )
+    text = models.TextField(
+        max_length=4096,
+        verbose_name=_('Message text'),
+        null=True,
+        blank=True,
+    )
+    media_file_ids = models.JSONField(
+        verbose_name=_('Media file IDs'),
+        null=True,
+        blank=True,
+    )
+    error_message = models.CharField(
+        verbose_name=_('Error message'),
+        max_length=4096,
+        null=True,
+        blank=True,
+    )
+    retries_count = models.PositiveIntegerField(
+        verbose_name=_('Retries left'),
+    )
+    to_be_sent_at = models.DateTimeField(
+        verbose_name=_('To be sent at'),
+    )
+    sent_at = models.DateTimeField(
+        verbose_name=_('Sent at'),
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_('Created at'),
+    )
+    updated_at = models.DateTimeField(
+        verbose_name=_('Updated at'),
+    )
+    reply_markup = models.JSONField(
+        verbose_name=_('Reply markup'),
+        null=True,
+        blank=True,
+    )
+    priority = models.PositiveSmallIntegerField(
+        verbose_name=_('Priority'),
+    )
+    archived_at = models.DateTimeField(
+        verbose_name=_('Archived at'),
+        auto_now_add=True,
+    )
+
+    class Meta:
+        verbose_name = _('Archived Telegram message')
+        verbose_name_plural = _('Archived Telegram messages')
+        ordering = ('-created_at',)
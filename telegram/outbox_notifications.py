@@ -0,0 +1,71 @@
+import logging
+from typing import Final
+
+import psycopg
+from django.db import DatabaseError, connection
+
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_OUTBOX_CHANNEL: Final[str] = 'telegram_outbox'
+
+
+def notify_telegram_outbox() -> None:
+    """
+    Wake up outbox workers listening for new messages.
+
+    Must be called after the transaction creating messages is committed,
+    otherwise workers would look for messages they can't see yet.
+    """
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [
+                TELEGRAM_OUTBOX_CHANNEL,
+                '',
+            ])
+    except DatabaseError:
+        logger.exception('Could not notify Telegram outbox workers')
+
+
+class TelegramOutboxListener:
+    """
+    Waits for `NOTIFY` of new outbox messages on its own DB connection.
+
+    The connection is separate from Django's one because it has to stay
+    in autocommit mode and keep listening between queries of the worker.
+    """
+
+    def __init__(self):
+        self.__connection: psycopg.Connection | None = None
+
+    def __get_connection(self) -> psycopg.Connection:
+        if self.__connection is None or self.__connection.closed:
+            self.__connection = psycopg.connect(
+                **connection.get_connection_params(),
+                autocommit=True,
+            )
+            self.__connection.execute(f'LISTEN {TELEGRAM_OUTBOX_CHANNEL}')
+        return self.__connection
+
+    def wait(self, timeout_in_seconds: float) -> bool:
+        """
+        Returns:
+            True if notified within the timeout, False otherwise.
+        """
+        listen_connection = self.__get_connection()
+        is_notified = False
+        for _ in listen_connection.notifies(
+            timeout=timeout_in_seconds,
+            stop_after=1,
+        ):
+            is_notified = True
+        if is_notified:
+            # Notifications of the same burst need only one wake-up.
+            for _ in listen_connection.notifies(timeout=0):
+                pass
+        return is_notified
+
+    def close(self) -> None:
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
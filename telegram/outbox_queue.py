@@ -0,0 +1,97 @@
+import logging
+import time
+from collections.abc import Iterable
+from typing import Final
+
+from django.conf import settings
+from redis import Redis, RedisError
+
+from core.services import get_redis
+from telegram.models import TelegramMessage
+
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES_REDIS_KEY: Final[str] = 'telegram-outbox:priorities'
+
+# Removes and returns ids of messages due by ARGV[1] in a single step,
+# so a message id is popped by one sender only.
+POP_DUE_MESSAGE_IDS_SCRIPT: Final[str] = '''
+local message_ids = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2]
+)
+if #message_ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(message_ids))
+end
+return message_ids
+'''
+
+
+def get_queue_redis_key(priority: int) -> str:
+    return f'telegram-outbox:queue:{priority}'
+
+
+class TelegramOutboxQueue:
+    """
+    Redis index of the Telegram outbox.
+
+    Every priority has its own sorted set of message ids scored by
+    `to_be_sent_at`, so due messages are popped in priority order
+    without sorting and without querying Postgres when nothing is due.
+    Postgres stays the source of truth: popped messages are still claimed
+    there, and messages missing in the queue are pushed again by
+    the reconciliation of the outbox worker.
+    """
+
+    def __init__(self, redis: Redis):
+        self.__redis = redis
+        self.__pop_due_message_ids = redis.register_script(
+            POP_DUE_MESSAGE_IDS_SCRIPT,
+        )
+
+    def push(self, messages: Iterable[TelegramMessage]) -> None:
+        pipeline = self.__redis.pipeline(transaction=False)
+        for message in messages:
+            pipeline.sadd(PRIORITIES_REDIS_KEY, message.priority)
+            pipeline.zadd(
+                get_queue_redis_key(message.priority),
+                {str(message.id): message.to_be_sent_at.timestamp()},
+            )
+        pipeline.execute()
+
+    def pop_due_message_ids(self, *, limit: int) -> list[int]:
+        priorities = sorted(
+            int(priority)
+            for priority in self.__redis.smembers(PRIORITIES_REDIS_KEY)
+        )
+        now = time.time()
+
+        message_ids: list[int] = []
+        for priority in priorities:
+            if len(message_ids) >= limit:
+                break
+            message_ids += [
+                int(message_id)
+                for message_id in self.__pop_due_message_ids(
+                    keys=[get_queue_redis_key(priority)],
+                    args=[now, limit - len(message_ids)],
+                )
+            ]
+        return message_ids
+
+
+def get_telegram_outbox_queue() -> TelegramOutboxQueue | None:
+    if not settings.TELEGRAM_OUTBOX_USE_REDIS_QUEUE:
+        return None
+    return TelegramOutboxQueue(get_redis())
+
+
+def push_to_telegram_outbox_queue(messages: list[TelegramMessage]) -> None:
+    """Failures are only logged, the reconciliation pushes messages later."""
+    outbox_queue = get_telegram_outbox_queue()
+    if outbox_queue is None:
+        return
+    try:
+        outbox_queue.push(messages)
+    except RedisError:
+        logger.exception('Could not push messages to the outbox queue')
@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from typing import Final, Protocol
+
+from django.conf import settings
+from redis import Redis, RedisError
+
+from core.services import get_redis
+
+
+logger = logging.getLogger(__name__)
+
+# https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+GLOBAL_MESSAGES_PER_SECOND: Final[float] = 30
+CHAT_MESSAGES_PER_SECOND: Final[float] = 1
+GLOBAL_BUCKET_REDIS_KEY: Final[str] = 'telegram-rate-limiter:global'
+
+# Takes a token from the bucket KEYS[1] refilled at ARGV[1] tokens per
+# second up to ARGV[2] tokens. Returns 0 if the token is taken, otherwise
+# seconds to wait for it. The time of the Redis server is used, so
+# buckets of all workers are refilled by the same clock.
+ACQUIRE_TOKEN_SCRIPT: Final[str] = '''
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+local wait_in_seconds = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait_in_seconds = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait_in_seconds)
+'''
+
+
+class Bucket(Protocol):
+
+    def acquire(self) -> None:
+        ...
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens are refilled continuously at `rate` tokens per second up to
+    `capacity`. `acquire` blocks until a token is available.
+    """
+
+    def __init__(self, *, rate: float, capacity: float):
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = capacity
+        self.__updated_at = time.monotonic()
+        self.__paused_until = 0.0
+        self.__lock = threading.Lock()
+
+    def __refill(self, now: float) -> None:
+        elapsed = max(now - self.__updated_at, 0)
+        self.__tokens = min(
+            self.__capacity,
+            self.__tokens + elapsed * self.__rate,
+        )
+        self.__updated_at = now
+
+    def acquire(self) -> None:
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                if now >= self.__paused_until:
+                    self.__refill(now)
+                    if self.__tokens >= 1:
+                        self.__tokens -= 1
+                        return
+                wait_in_seconds = max(
+                    self.__paused_until - now,
+                    (1 - self.__tokens) / self.__rate,
+                )
+            time.sleep(wait_in_seconds)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds` seconds."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__paused_until = max(self.__paused_until, now + seconds)
+            # A single request is allowed right after the pause.
+            self.__tokens = min(1, self.__capacity)
+            self.__updated_at = self.__paused_until
+
+
+class RedisTokenBucket:
+    """
+    Token bucket stored in Redis and shared by all processes.
+
+    If Redis is unavailable, tokens are taken from the local fallback
+    bucket, so the limit is kept per process until Redis is back.
+    """
+
+    def __init__(
+        self,
+        *,
+        redis: Redis,
+        key: str,
+        rate: float,
+        capacity: float,
+    ):
+        self.__key = key
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__acquire_token = redis.register_script(ACQUIRE_TOKEN_SCRIPT)
+        self.__fallback_bucket = TokenBucket(rate=rate, capacity=capacity)
+        self.__is_redis_available = True
+
+    def acquire(self) -> None:
+        while True:
+            try:
+                wait_in_seconds = float(
+                    self.__acquire_token(
+                        keys=[self.__key],
+                        args=[self.__rate, self.__capacity],
+                    ),
+                )
+            except RedisError:
+                if self.__is_redis_available:
+                    logger.exception(
+                        'Could not take a token from Redis bucket %s,'
+                        ' using the local bucket',
+                        self.__key,
+                    )
+                    self.__is_redis_available = False
+                self.__fallback_bucket.acquire()
+                return
+            self.__is_redis_available = True
+            if wait_in_seconds <= 0:
+                return
+            time.sleep(wait_in_seconds)
+
+
+class TelegramRateLimiter:
+    """
+    Limits outgoing messages both per chat and for the bot in total.
+
+    Every chat gets its own bucket, and all of them share the global
+    bucket, so sending to different chats runs in parallel only as long
+    as the bot stays under the global limit.
+
+    The global limit is per bot, so with several outbox workers the
+    global bucket must be shared through Redis: a bucket per process
+    lets N workers send N times the limit. Chat buckets are kept per
+    process.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_messages_per_second: float = GLOBAL_MESSAGES_PER_SECOND,
+        chat_messages_per_second: float = CHAT_MESSAGES_PER_SECOND,
+        redis: Redis | None = None,
+    ):
+        """
+        Keyword Args:
+            redis: Share the global bucket through it instead of keeping
+                it in this process.
+        """
+        self.__chat_messages_per_second = chat_messages_per_second
+        self.__global_bucket: Bucket
+        if redis is None:
+            self.__global_bucket = TokenBucket(
+                rate=global_messages_per_second,
+                capacity=global_messages_per_second,
+            )
+        else:
+            self.__global_bucket = RedisTokenBucket(
+                redis=redis,
+                key=GLOBAL_BUCKET_REDIS_KEY,
+                rate=global_messages_per_second,
+                capacity=global_messages_per_second,
+            )
+        self.__chat_id_to_bucket: dict[int, TokenBucket] = {}
+        self.__lock = threading.Lock()
+
+    def __get_chat_bucket(self, chat_id: int) -> TokenBucket:
+        with self.__lock:
+            if chat_id not in self.__chat_id_to_bucket:
+                self.__chat_id_to_bucket[chat_id] = TokenBucket(
+                    rate=self.__chat_messages_per_second,
+                    capacity=1,
+                )
+            return self.__chat_id_to_bucket[chat_id]
+
+    def acquire(self, chat_id: int) -> None:
+        self.__get_chat_bucket(chat_id).acquire()
+        self.__global_bucket.acquire()
+
+    def pause_chat(self, *, chat_id: int, seconds: float) -> None:
+        self.__get_chat_bucket(chat_id).pause(seconds)
+
+
+def get_telegram_rate_limiter() -> TelegramRateLimiter:
+    if not settings.TELEGRAM_RATE_LIMITER_USE_REDIS:
+        return TelegramRateLimiter()
+    return TelegramRateLimiter(redis=get_redis())
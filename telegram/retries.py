@@ -0,0 +1,59 @@
+import datetime
+import random
+from typing import Final
+
+from telebot.apihelper import ApiTelegramException
+
+
+RETRY_BASE_DELAY: Final[datetime.timedelta] = datetime.timedelta(seconds=30)
+RETRY_MAX_DELAY: Final[datetime.timedelta] = datetime.timedelta(hours=1)
+
+# Telegram answers the same way to the same request to these errors:
+# bot is blocked or kicked, chat is not found, message is malformed etc.
+PERMANENT_ERROR_CODES: Final[frozenset[int]] = frozenset({400, 403})
+# The bot token is invalid or revoked. Every message fails the same way
+# until the token is fixed, so these errors say nothing about the message.
+BOT_ERROR_CODES: Final[frozenset[int]] = frozenset({401, 404})
+
+
+def get_retry_after(error: ApiTelegramException) -> int | None:
+    """
+    Returns:
+        Seconds to wait before the next request if Telegram responded
+        with "429 Too Many Requests", None otherwise.
+    """
+    if error.error_code != 429:
+        return None
+    parameters = error.result_json.get('parameters') or {}
+    return parameters.get('retry_after')
+
+
+def is_permanent_error(error: ApiTelegramException) -> bool:
+    return error.error_code in PERMANENT_ERROR_CODES
+
+
+def is_bot_error(error: ApiTelegramException) -> bool:
+    return error.error_code in BOT_ERROR_CODES
+
+
+def get_retry_delay(
+    *,
+    failed_attempts_count: int,
+    retry_after: int | None = None,
+) -> datetime.timedelta:
+    """
+    Exponential backoff with jitter.
+
+    The delay doubles with every failed attempt up to `RETRY_MAX_DELAY`
+    and a random half of it is cut off, so messages failed at the same
+    time are not retried at the same time. The delay is never shorter
+    than `retry_after` requested by Telegram.
+    """
+    max_delay = min(
+        RETRY_BASE_DELAY * 2 ** max(failed_attempts_count - 1, 0),
+        RETRY_MAX_DELAY,
+    )
+    delay = max_delay * random.uniform(0.5, 1)
+    if retry_after is not None:
+        delay = max(delay, datetime.timedelta(seconds=retry_after))
+    return delay
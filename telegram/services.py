@@ -3,11 +3,10 @@ import logging
 from collections.abc import Iterable
 from dataclasses import dataclass
 
-from django.conf import settings
-from django.db.models import QuerySet
+from django.db import transaction
+from django.db.models import Q, QuerySet
 from django.db.utils import IntegrityError
 from django.utils import timezone
-from telebot import TeleBot
 from telebot.apihelper import ApiTelegramException
 from telebot.types import (
     InlineKeyboardMarkup,
@@ -17,12 +16,42 @@ from telebot.types import (
 )
 
 from core.exceptions import AlreadyExistsError
-from telegram.models import TelegramChat, TelegramMessage
+from telegram.client import get_telegram_bot
+from telegram.html_splitter import split_html_text
+from telegram.models import (
+    ArchivedTelegramMessage,
+    TelegramChat,
+    TelegramMessage,
+)
+from telegram.outbox_notifications import notify_telegram_outbox
+from telegram.outbox_queue import push_to_telegram_outbox_queue
+from telegram.retries import (
+    get_retry_after,
+    get_retry_delay,
+    is_bot_error,
+    is_permanent_error,
+)
 from telegram.selectors import get_telegram_chats_by_chat_id
 
 
 logger = logging.getLogger(__name__)
 
+# Must be longer than any batch takes to be sent: after the lease is over
+# other senders consider the sender of the message crashed.
+MESSAGE_CLAIM_LEASE = datetime.timedelta(minutes=15)
+MAX_TEXT_LENGTH = TelegramMessage._meta.get_field('text').max_length
+COALESCED_MESSAGES_SEPARATOR = '\n\n'
+# Fields changed by sending a message.
+SENDING_OUTCOME_FIELDS = (
+    'sent_at',
+    'chat_message_ids',
+    'retries_count',
+    'error_message',
+    'to_be_sent_at',
+    'claimed_at',
+    'updated_at',
+)
+
 
 def update_telegram_chat(
     *,
@@ -52,16 +81,97 @@ def create_telegram_chat(
         raise AlreadyExistsError('Chat with provided chat ID already exists')
 
 
-def get_telegram_bot() -> TeleBot:
-    return TeleBot(token=settings.TELEGRAM_BOT_TOKEN, parse_mode='HTML')
+def get_pending_messages(
+    *,
+    limit: int = 30,
+    message_ids: Iterable[int] | None = None,
+) -> QuerySet[TelegramMessage]:
+    now = timezone.now()
+    messages = TelegramMessage.objects.filter(
+        Q(claimed_at__isnull=True)
+        | Q(claimed_at__lt=now - MESSAGE_CLAIM_LEASE),
+        sent_at__isnull=True,
+        retries_count__gt=0,
+        to_be_sent_at__lte=now,
+    )
+    if message_ids is not None:
+        messages = messages.filter(id__in=message_ids)
+    return messages.order_by(
+        'priority',
+        'to_be_sent_at',
+        'created_at',
+        'id',
+    )[:limit]
 
 
-def get_pending_messages(*, limit: int = 30) -> QuerySet[TelegramMessage]:
+def get_scheduled_messages(*, limit: int) -> QuerySet[TelegramMessage]:
+    """Not claimed messages waiting to be sent, now or later."""
     return TelegramMessage.objects.filter(
+        Q(claimed_at__isnull=True)
+        | Q(claimed_at__lt=timezone.now() - MESSAGE_CLAIM_LEASE),
         sent_at__isnull=True,
         retries_count__gt=0,
-        to_be_sent_at__lte=timezone.now(),
-    ).order_by('priority', 'to_be_sent_at', 'created_at')[:limit]
+    ).order_by('priority', 'to_be_sent_at', 'created_at', 'id')[:limit]
+
+
+def claim_pending_messages(
+    *,
+    limit: int = 30,
+    message_ids: Iterable[int] | None = None,
+) -> list[TelegramMessage]:
+    """
+    Take pending messages for sending so that no other sender takes them.
+
+    Rows locked by other senders are skipped, so any number of senders
+    can drain the outbox in parallel. The claim expires after
+    `MESSAGE_CLAIM_LEASE`, after that messages of a crashed sender are
+    claimed again.
+
+    Keyword Args:
+        message_ids: claim only these messages if they are still pending.
+    """
+    with transaction.atomic():
+        messages = list(
+            get_pending_messages(limit=limit, message_ids=message_ids)
+            .select_for_update(skip_locked=True),
+        )
+        claimed_at = timezone.now()
+        TelegramMessage.objects.filter(
+            id__in=[message.id for message in messages],
+        ).update(claimed_at=claimed_at)
+
+    for message in messages:
+        message.claimed_at = claimed_at
+    return messages
+
+
+def save_sending_outcomes(
+    messages: Iterable[TelegramMessage],
+    *,
+    batch_size: int = 100,
+) -> int:
+    """
+    Write back the result of sending and release the messages.
+
+    Only fields changed by sending are updated, in batches.
+    """
+    messages = list(messages)
+    updated_at = timezone.now()
+    for message in messages:
+        message.claimed_at = None
+        message.updated_at = updated_at
+    return TelegramMessage.objects.bulk_update(
+        messages,
+        fields=SENDING_OUTCOME_FIELDS,
+        batch_size=batch_size,
+    )
+
+
+def release_messages(messages: Iterable[TelegramMessage]) -> int:
+    """Give claimed but not processed messages back to the outbox."""
+    return TelegramMessage.objects.filter(
+        id__in=[message.id for message in messages],
+    ).update(claimed_at=None)
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -145,25 +255,191 @@ class TelegramMessageSender:
             media=media,
         )
 
-    def send(self) -> None:
-        media_file_ids = self.get_media_file_ids()
+    def send_messages(self) -> list[Message]:
+        if self.get_media_file_ids():
+            return self.send_media_group_message()
+        return [self.send_text_message()]
+
+    def mark_as_sent(self, sent_messages: Iterable[Message]) -> None:
+        self.message.sent_at = timezone.now()
+        self.message.chat_message_ids = [
+            msg.message_id for msg in sent_messages
+        ]
 
-        try:
-            if media_file_ids:
-                sent_messages = self.send_media_group_message()
-            else:
-                sent_message = self.send_text_message()
-                sent_messages = [sent_message]
-        except ApiTelegramException as error:
-            self.message.retries_count -= 1
-            self.message.error_message = str(error)
-        else:
-            self.message.sent_at = timezone.now()
-            self.message.chat_message_ids = [
-                msg.message_id for msg in sent_messages
-            ]
+    def mark_as_failed(self, error: Exception) -> None:
+        """
+        Schedule the next attempt with backoff.
 
-        self.message.save()
+        Permanent errors use up all retries of the message at once.
+        Errors of the bot itself don't spend retries: the message waits
+        until the bot token is fixed. Other errors, such as network
+        errors, are retried like failed API requests.
+        """
+        self.message.error_message = str(error)
+        retry_after = None
+        if isinstance(error, ApiTelegramException):
+            if is_permanent_error(error):
+                self.message.retries_count = 0
+                return
+            if is_bot_error(error):
+                logger.error(
+                    'Telegram rejected the bot token, message %s is'
+                    ' postponed: %s',
+                    self.message.id,
+                    error,
+                )
+                self.message.to_be_sent_at = (
+                    timezone.now() + get_retry_delay(failed_attempts_count=1)
+                )
+                return
+            retry_after = get_retry_after(error)
+
+        self.message.retries_count -= 1
+        default_retries_count = TelegramMessage._meta.get_field(
+            'retries_count',
+        ).default
+        self.message.to_be_sent_at = timezone.now() + get_retry_delay(
+            failed_attempts_count=(
+                default_retries_count - self.message.retries_count
+            ),
+            retry_after=retry_after,
+        )
+
+    def postpone(self, seconds: float) -> None:
+        self.message.to_be_sent_at = (
+            timezone.now() + datetime.timedelta(seconds=seconds)
+        )
+
+
+def is_coalescible_message(message: TelegramMessage) -> bool:
+    return (
+        message.text is not None
+        and not message.media_file_ids
+        and message.reply_markup is None
+    )
+
+
+def coalesce_messages(
+    messages: Iterable[TelegramMessage],
+    *,
+    separator: str = COALESCED_MESSAGES_SEPARATOR,
+    max_text_length: int = MAX_TEXT_LENGTH,
+) -> list[list[TelegramMessage]]:
+    """
+    Group consecutive text messages that fit into one message together.
+
+    Messages with media or reply markup are never grouped. The order of
+    messages is kept.
+    """
+    groups: list[list[TelegramMessage]] = []
+    group_text_length = 0
+    for message in messages:
+        if groups and is_coalescible_message(message):
+            last_group = groups[-1]
+            text_length = group_text_length + len(separator) + len(
+                message.text,
+            )
+            if (
+                is_coalescible_message(last_group[-1])
+                and last_group[-1].chat_id == message.chat_id
+                and text_length <= max_text_length
+            ):
+                last_group.append(message)
+                group_text_length = text_length
+                continue
+        groups.append([message])
+        group_text_length = len(message.text or '')
+    return groups
+
+
+def join_messages(
+    messages: list[TelegramMessage],
+    *,
+    separator: str = COALESCED_MESSAGES_SEPARATOR,
+) -> TelegramMessage:
+    """
+    Returns:
+        Not saved message with texts of all the messages.
+    """
+    if len(messages) == 1:
+        return messages[0]
+    return TelegramMessage(
+        chat_id=messages[0].chat_id,
+        text=separator.join(message.text for message in messages),
+    )
+
+
+def get_finished_messages(
+    *,
+    finished_before: datetime.datetime,
+) -> QuerySet[TelegramMessage]:
+    """Messages that are sent or have no retries left."""
+    return TelegramMessage.objects.filter(
+        Q(sent_at__lt=finished_before)
+        | Q(
+            sent_at__isnull=True,
+            retries_count=0,
+            updated_at__lt=finished_before,
+        ),
+    )
+
+
+def archive_finished_messages(
+    *,
+    finished_before: datetime.datetime,
+    batch_size: int = 1000,
+    is_delete_only: bool = False,
+) -> int:
+    """
+    Move finished messages out of the outbox batch by batch.
+
+    Every batch is moved in its own short transaction, so the outbox
+    table is never locked for long.
+
+    Keyword Args:
+        is_delete_only: delete messages without copying them to the archive.
+
+    Returns:
+        Count of archived (or deleted) messages.
+    """
+    archived_messages_count = 0
+    while True:
+        with transaction.atomic():
+            messages = list(
+                get_finished_messages(finished_before=finished_before)
+                .order_by('id')
+                .select_for_update(skip_locked=True)[:batch_size],
+            )
+            if not messages:
+                break
+            if not is_delete_only:
+                ArchivedTelegramMessage.objects.bulk_create(
+                    [
+                        ArchivedTelegramMessage(
+                            id=message.id,
+                            chat_id=message.chat_id,
+                            chat_message_ids=message.chat_message_ids,
+                            text=message.text,
+                            media_file_ids=message.media_file_ids,
+                            error_message=message.error_message,
+                            retries_count=message.retries_count,
+                            to_be_sent_at=message.to_be_sent_at,
+                            sent_at=message.sent_at,
+                            created_at=message.created_at,
+                            updated_at=message.updated_at,
+                            reply_markup=message.reply_markup,
+                            priority=message.priority,
+                        )
+                        for message in messages
+                    ],
+                    ignore_conflicts=True,
+                )
+            TelegramMessage.objects.filter(
+                id__in=[message.id for message in messages],
+            ).delete()
+        archived_messages_count += len(messages)
+        logger.debug('Archived %d Telegram messages', archived_messages_count)
+    return archived_messages_count
 
 
 def batch_create_telegram_messages(
@@ -180,14 +456,30 @@ def batch_create_telegram_messages(
     extra_params = {}
     if media_file_ids is not None:
         extra_params['media_file_ids'] = list(media_file_ids)
+        texts = [text]
+    else:
+        # Captions are not split, too long text is sent as several
+        # messages with reply markup attached to the last one.
+        texts = split_html_text(text, max_length=MAX_TEXT_LENGTH)
     messages = [
         TelegramMessage(
             chat_id=chat_id,
-            text=text,
-            reply_markup=reply_markup,
+            text=text_part,
+            reply_markup=reply_markup if is_last_part else None,
             to_be_sent_at=to_be_sent_at,
             **extra_params,
         )
         for chat_id in chat_ids
+        for text_part, is_last_part in zip(
+            texts,
+            [False] * (len(texts) - 1) + [True],
+        )
     ]
-    return TelegramMessage.objects.bulk_create(messages)
+    messages = TelegramMessage.objects.bulk_create(messages)
+
+    def wake_up_outbox_workers() -> None:
+        push_to_telegram_outbox_queue(messages)
+        notify_telegram_outbox()
+
+    transaction.on_commit(wake_up_outbox_workers)
+    return messages
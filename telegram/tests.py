@@ -0,0 +1,70 @@
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from telegram.dispatcher import TelegramMessageDispatcher
+from telegram.html_splitter import split_html_text
+from telegram.models import TelegramMessage
+from telegram.rate_limiting import TelegramRateLimiter
+
+
+class TelegramMessageDispatcherTests(SimpleTestCase):
+
+    @mock.patch('telegram.dispatcher.release_messages')
+    @mock.patch('telegram.dispatcher.save_sending_outcomes')
+    @mock.patch('telegram.services.get_telegram_bot')
+    def test_connection_error_spends_retry_with_backoff(
+        self,
+        get_telegram_bot,
+        save_sending_outcomes,
+        release_messages,
+    ):
+        get_telegram_bot.return_value.send_message.side_effect = (
+            requests.ConnectionError('Connection refused')
+        )
+        dispatched_at = timezone.now()
+        failed_message, later_message = [
+            TelegramMessage(
+                id=message_id,
+                chat_id=1,
+                text=f'Message {message_id}',
+                to_be_sent_at=dispatched_at,
+            )
+            for message_id in (1, 2)
+        ]
+
+        with TelegramMessageDispatcher(
+            rate_limiter=TelegramRateLimiter(chat_messages_per_second=100),
+        ) as dispatcher:
+            with self.assertLogs('telegram.dispatcher', level='ERROR'):
+                processed_messages_count = dispatcher.dispatch(
+                    [failed_message, later_message],
+                )
+
+        self.assertEqual(processed_messages_count, 2)
+        get_telegram_bot.return_value.send_message.assert_called_once()
+        save_sending_outcomes.assert_called_once()
+        release_messages.assert_not_called()
+
+        self.assertEqual(failed_message.retries_count, 4)
+        self.assertEqual(failed_message.error_message, 'Connection refused')
+        self.assertGreater(failed_message.to_be_sent_at, dispatched_at)
+
+        self.assertEqual(later_message.retries_count, 5)
+        self.assertEqual(
+            later_message.to_be_sent_at,
+            failed_message.to_be_sent_at,
+        )
+
+
+class SplitHtmlTextTests(SimpleTestCase):
+
+    def test_long_paragraph_is_not_reflowed(self):
+        paragraph = ' '.join(f'word{i}' for i in range(400))
+        text = f'{paragraph}\n<b>{paragraph}</b>'
+
+        parts = split_html_text(text, max_length=4096)
+
+        self.assertEqual(parts, [paragraph, f'<b>{paragraph}</b>'])
@@ -0,0 +1,23 @@
+import datetime
+from dataclasses import dataclass
+
+from django.utils import timezone
+
+from telegram.services import archive_finished_messages
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ArchiveTelegramMessagesUseCase:
+    retention_in_days: int
+    batch_size: int = 1000
+    is_delete_only: bool = False
+
+    def execute(self) -> int:
+        finished_before = (
+            timezone.now() - datetime.timedelta(days=self.retention_in_days)
+        )
+        return archive_finished_messages(
+            finished_before=finished_before,
+            batch_size=self.batch_size,
+            is_delete_only=self.is_delete_only,
+        )
@@ -1,12 +1,44 @@
-import time
+from dataclasses import dataclass
 
-from telegram.services import get_pending_messages, TelegramMessageSender
+from telegram.dispatcher import TelegramMessageDispatcher
+from telegram.outbox_notifications import TelegramOutboxListener
+from telegram.outbox_queue import get_telegram_outbox_queue
+from telegram.services import claim_pending_messages
+from telegram.worker import TelegramOutboxWorker
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class SendPendingTelegramMessagesUseCase:
-    def execute(self):
-        messages = get_pending_messages()
+    limit: int = 300
+    is_coalescing_enabled: bool = False
 
-        for message in messages:
-            TelegramMessageSender(message=message).send()
-            time.sleep(0.5)
+    def execute(self) -> int:
+        messages = claim_pending_messages(limit=self.limit)
+        with TelegramMessageDispatcher(
+            is_coalescing_enabled=self.is_coalescing_enabled,
+        ) as dispatcher:
+            return dispatcher.dispatch(messages)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RunTelegramOutboxWorkerUseCase:
+    batch_size: int = 300
+    poll_interval_in_seconds: float = 1
+    is_coalescing_enabled: bool = False
+    is_listening: bool = False
+
+    def execute(self) -> None:
+        with TelegramMessageDispatcher(
+            is_coalescing_enabled=self.is_coalescing_enabled,
+        ) as dispatcher:
+            worker = TelegramOutboxWorker(
+                dispatcher=dispatcher,
+                batch_size=self.batch_size,
+                poll_interval_in_seconds=self.poll_interval_in_seconds,
+                outbox_queue=get_telegram_outbox_queue(),
+                listener=(
+                    TelegramOutboxListener() if self.is_listening else None
+                ),
+            )
+            worker.install_signal_handlers()
+            worker.run()
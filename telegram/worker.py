@@ -0,0 +1,171 @@
+import logging
+import signal
+import threading
+import time
+
+import psycopg
+from django.db import connection
+from django.db.utils import InterfaceError, OperationalError
+from redis import RedisError
+
+from telegram.client import get_telegram_connection_pool_stats
+from telegram.dispatcher import TelegramMessageDispatcher
+from telegram.models import TelegramMessage
+from telegram.outbox_notifications import TelegramOutboxListener
+from telegram.outbox_queue import TelegramOutboxQueue
+from telegram.services import claim_pending_messages, get_scheduled_messages
+
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramOutboxWorker:
+    """
+    Long-running sender of pending Telegram messages.
+
+    Sends pending messages batch by batch as long as there are any, then
+    polls the outbox every `poll_interval_in_seconds`. The DB connection
+    and the dispatcher threads with their HTTP sessions are kept open
+    for the whole lifetime of the worker.
+
+    On SIGTERM or SIGINT the worker stops taking new messages, waits for
+    the messages being sent and exits. Messages not sent yet stay pending.
+
+    With the outbox queue, due messages are popped from Redis and polls
+    of an empty outbox don't touch Postgres. Messages left pending after
+    dispatching are pushed back, and every `reconcile_interval_in_seconds`
+    all waiting messages are pushed to the queue again in case some were
+    missed. If Redis is unavailable, messages are taken from Postgres.
+
+    With the listener, the worker wakes up as soon as new messages are
+    created and `poll_interval_in_seconds` only bounds the delay of
+    messages scheduled for later or created without notification.
+    """
+
+    def __init__(
+        self,
+        *,
+        dispatcher: TelegramMessageDispatcher,
+        batch_size: int = 300,
+        poll_interval_in_seconds: float = 1,
+        outbox_queue: TelegramOutboxQueue | None = None,
+        reconcile_interval_in_seconds: float = 60,
+        listener: TelegramOutboxListener | None = None,
+    ):
+        self.__dispatcher = dispatcher
+        self.__batch_size = batch_size
+        self.__poll_interval_in_seconds = poll_interval_in_seconds
+        self.__outbox_queue = outbox_queue
+        self.__reconcile_interval_in_seconds = reconcile_interval_in_seconds
+        self.__reconciled_at: float | None = None
+        self.__listener = listener
+        self.__stop_event = threading.Event()
+
+    def stop(self, *args) -> None:
+        logger.info('Stopping Telegram outbox worker')
+        self.__stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def claim_messages(self) -> list[TelegramMessage]:
+        if self.__outbox_queue is None:
+            return claim_pending_messages(limit=self.__batch_size)
+        try:
+            message_ids = self.__outbox_queue.pop_due_message_ids(
+                limit=self.__batch_size,
+            )
+        except RedisError:
+            logger.exception('Could not pop messages from the outbox queue')
+            return claim_pending_messages(limit=self.__batch_size)
+        if not message_ids:
+            return []
+        return claim_pending_messages(
+            limit=len(message_ids),
+            message_ids=message_ids,
+        )
+
+    def requeue_messages(self, messages: list[TelegramMessage]) -> None:
+        if self.__outbox_queue is None:
+            return
+        pending_messages = [
+            message for message in messages
+            if message.sent_at is None and message.retries_count > 0
+        ]
+        if not pending_messages:
+            return
+        try:
+            self.__outbox_queue.push(pending_messages)
+        except RedisError:
+            logger.exception('Could not push messages to the outbox queue')
+
+    def reconcile_outbox_queue(self) -> None:
+        if self.__outbox_queue is None:
+            return
+        now = time.monotonic()
+        if self.__reconciled_at is not None and (
+            now - self.__reconciled_at < self.__reconcile_interval_in_seconds
+        ):
+            return
+        self.__reconciled_at = now
+        try:
+            self.__outbox_queue.push(get_scheduled_messages(limit=1000))
+        except RedisError:
+            logger.exception('Could not reconcile the outbox queue')
+
+    def run_once(self) -> int:
+        self.reconcile_outbox_queue()
+        messages = self.claim_messages()
+        processed_messages_count = self.__dispatcher.dispatch(
+            messages,
+            stop_event=self.__stop_event,
+        )
+        self.requeue_messages(messages)
+        if processed_messages_count:
+            logger.debug(
+                'Processed %d messages. Telegram connection pool: %s',
+                processed_messages_count,
+                get_telegram_connection_pool_stats(),
+            )
+        return processed_messages_count
+
+    def wait_for_messages(self) -> None:
+        if self.__listener is None:
+            self.__stop_event.wait(self.__poll_interval_in_seconds)
+            return
+
+        waiting_until = time.monotonic() + self.__poll_interval_in_seconds
+        while not self.__stop_event.is_set():
+            timeout_in_seconds = waiting_until - time.monotonic()
+            if timeout_in_seconds <= 0:
+                return
+            try:
+                # Short waits to notice the stop event in time.
+                if self.__listener.wait(min(timeout_in_seconds, 1)):
+                    return
+            except psycopg.Error:
+                logger.exception('Could not listen for new outbox messages')
+                self.__listener.close()
+                self.__stop_event.wait(timeout_in_seconds)
+                return
+
+    def run(self) -> None:
+        logger.info('Telegram outbox worker started')
+        while not self.__stop_event.is_set():
+            try:
+                processed_messages_count = self.run_once()
+            except (InterfaceError, OperationalError):
+                logger.exception('Database error in Telegram outbox worker')
+                # Django reconnects on the next query.
+                connection.close()
+                processed_messages_count = 0
+
+            if processed_messages_count < self.__batch_size:
+                self.wait_for_messages()
+        if self.__listener is not None:
+            self.__listener.close()
+        logger.info(
+            'Telegram outbox worker stopped. Telegram connection pool: %s',
+            get_telegram_connection_pool_stats(),
+        )
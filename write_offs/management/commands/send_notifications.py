@@ -1,7 +1,7 @@
 from django.core.management import BaseCommand
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
 
-from reports.models.report_routes import ReportRoute
+from reports.services.report_routing_table import report_routing_table_cache
 from telegram.services import batch_create_telegram_messages
 from write_offs.services import (
     get_upcoming_write_offs, get_write_off_status, format_write_off,
@@ -12,19 +12,13 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         write_offs = get_upcoming_write_offs()
+        unit_uuid_to_chat_ids = report_routing_table_cache.get('WRITE_OFFS')
         for write_off in write_offs:
             status = get_write_off_status(write_off)
             if status is None:
                 continue
             text = format_write_off(write_off, status)
-            chat_ids = (
-                ReportRoute.objects
-                .filter(
-                    report_type__name='WRITE_OFFS',
-                    unit__uuid=write_off.unit.uuid,
-                )
-                .values_list('telegram_chat__chat_id', flat=True)
-            )
+            chat_ids = unit_uuid_to_chat_ids.get(write_off.unit.uuid, [])
 
             batch_create_telegram_messages(
                 chat_ids=chat_ids,
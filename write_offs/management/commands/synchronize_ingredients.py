@@ -1,8 +1,7 @@
 from django.core.management import BaseCommand
 
 from accounts.models import AccountTokens
-from accounts.services.crypt import decrypt_string
-from reports.services.gateways.dodo_is_api import get_dodo_is_api_gateway
+from reports.services.account_gateways import get_account_dodo_is_api_gateway
 from write_offs.models import Ingredient
 
 
@@ -11,11 +10,8 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         accounts_tokens = AccountTokens.objects.all()
         for account_tokens in accounts_tokens:
-            access_token = decrypt_string(
-                account_tokens.encrypted_access_token,
-            )
-            with get_dodo_is_api_gateway(
-                access_token=access_token,
+            with get_account_dodo_is_api_gateway(
+                account_tokens,
             ) as dodo_is_api_gateway:
                 for stock_items in dodo_is_api_gateway.get_stock_items():
                     ingredients = [